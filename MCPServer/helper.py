@@ -1,3 +1,4 @@
+import csv
 import json
 import time
 import sys
@@ -7,10 +8,19 @@ import socket
 
 from helper_utils import (
     managed_document,
+    lock_document,
+    release_document_locks,
+    store_document,
     normalize_path,
     ensure_directory_exists,
     get_uno_desktop,
+    get_office_context,
     create_property_value,
+    get_cached,
+    set_cached,
+    build_paragraph_index,
+    collect_paragraphs,
+    remove_paragraph_index_entries,
     HelperError,
 )
 
@@ -24,6 +34,14 @@ from helper_test_functions import (
     get_slide_image_info,
 )
 
+from helper_images import (
+    DEFAULT_DPI,
+    get_image_info,
+    image_size_100mm,
+    load_graphic,
+    optimize_image,
+)
+
 import logging
 
 print("Starting LibreOffice Helper Script...")
@@ -33,17 +51,18 @@ try:
     print("Importing UNO...")
     logging.info("Importing UNO...")
     import uno
-    from com.sun.star.beans import PropertyValue
     from com.sun.star.text import ControlCharacter
     from com.sun.star.text.TextContentAnchorType import AS_CHARACTER
     from com.sun.star.awt import Size
     from com.sun.star.awt.FontSlant import ITALIC
-    from com.sun.star.lang import Locale
+    from com.sun.star.lang import Locale, IllegalArgumentException
+    from com.sun.star.io import IOException
     from com.sun.star.style.ParagraphAdjust import CENTER, LEFT, RIGHT, BLOCK
     from com.sun.star.style.BreakType import PAGE_BEFORE
     from com.sun.star.table import BorderLine2, TableBorder2
     from com.sun.star.table.BorderLineStyle import SOLID
     from com.sun.star.text.ControlCharacter import PARAGRAPH_BREAK
+    from com.sun.star.beans.PropertyState import DIRECT_VALUE
     from com.sun.star.connection import NoConnectException
 
     print("UNO imported successfully!")
@@ -236,6 +255,7 @@ def copy_document(source_path, target_path):
         # Save to new location
         target_url = uno.systemPathToFileUrl(target_path)
         props = [create_property_value("Overwrite", True)]
+        release_document_locks(doc)
         doc.storeToURL(target_url, tuple(props))
 
     if os.path.exists(target_path):
@@ -248,9 +268,29 @@ def copy_document(source_path, target_path):
         return f"Successfully copied document to: {target_path}"
 
 
+# Statistics LibreOffice keeps in the document metadata (meta:document-statistic)
+DOCUMENT_STATISTICS = [
+    "PageCount",
+    "TableCount",
+    "ImageCount",
+    "ObjectCount",
+    "ParagraphCount",
+    "WordCount",
+    "CharacterCount",
+    "NonWhitespaceCharacterCount",
+]
+
+# Counts the Writer model exposes itself, used when the file stores no statistics
+WRITER_MODEL_STATISTICS = ["WordCount", "CharacterCount", "ParagraphCount"]
+
+
 def get_document_properties(file_path):
     """Extract document properties and statistics."""
-    with managed_document(file_path) as doc:
+    cached = get_cached(file_path, "properties")
+    if cached is not None:
+        return json.dumps(cached, indent=2)
+
+    with managed_document(file_path, read_only=True) as doc:
         props = {}
 
         # Get basic document properties
@@ -278,36 +318,291 @@ def get_document_properties(file_path):
                             else str(date_val)
                         )
 
-        # Get document statistics
-        if hasattr(doc, "WordCount") and hasattr(doc.WordCount, "getWordCount"):
-            props["WordCount"] = doc.WordCount.getWordCount()
+            # Get document statistics in a single call rather than walking the text
+            statistics = {
+                stat.Name: stat.Value for stat in doc_props.DocumentStatistics
+            }
+            for stat_name in DOCUMENT_STATISTICS:
+                if stat_name in statistics:
+                    props[stat_name] = statistics[stat_name]
 
+        # Files without stored statistics (Word, plain text, other ODF
+        # producers) fall back to the counts Writer computes for its model
         if hasattr(doc, "getText"):
-            text = doc.getText()
-            props["CharacterCount"] = len(text.getString())
+            for stat_name in WRITER_MODEL_STATISTICS:
+                if stat_name not in props:
+                    try:
+                        props[stat_name] = doc.getPropertyValue(stat_name)
+                    except Exception as stat_error:
+                        logging.warning(f"Could not read {stat_name}: {stat_error}")
+
+        if hasattr(doc, "getDrawPages"):
+            props["SlideCount"] = doc.getDrawPages().getCount()
+
+    set_cached(file_path, "properties", props)
+    return json.dumps(props, indent=2)
+
+
+def find_paragraph_for_range(text, paragraphs, text_range):
+    """Binary search (index, paragraph) pairs for the paragraph containing a range."""
+    low, high = 0, len(paragraphs) - 1
+    found = None
+    while low <= high:
+        mid = (low + high) // 2
+        # compareRegionStarts returns -1 when the paragraph starts after the range
+        if text.compareRegionStarts(paragraphs[mid][1], text_range) >= 0:
+            found = paragraphs[mid][0]
+            low = mid + 1
+        else:
+            high = mid - 1
+    return found
+
+
+def build_writer_outline(doc):
+    """Build a Writer outline in a single pass over the top-level paragraphs."""
+    text = doc.getText()
+    table_names = list(doc.getTextTables().getElementNames())
+
+    headings = []
+    heading_stack = []
+    tables = []
+    paragraphs = []
+    paragraph_index = 0
+
+    enum = text.createEnumeration()
+    while enum.hasMoreElements():
+        element = enum.nextElement()
+        if element.supportsService("com.sun.star.text.TextTable"):
+            name = element.getName()
+            tables.append(
+                {
+                    "table_index": (
+                        table_names.index(name) if name in table_names else None
+                    ),
+                    "name": name,
+                    "paragraph_index": paragraph_index,
+                    "rows": element.getRows().getCount(),
+                    "columns": element.getColumns().getCount(),
+                }
+            )
+        else:
+            paragraphs.append((paragraph_index, element))
+            outline_level = element.getPropertyValue("OutlineLevel")
+            if outline_level > 0:
+                heading = {
+                    "level": outline_level,
+                    "text": element.getString(),
+                    "paragraph_index": paragraph_index,
+                    "children": [],
+                }
+                # Nest the heading under the closest preceding higher-level heading
+                while heading_stack and heading_stack[-1]["level"] >= outline_level:
+                    heading_stack.pop()
+                if heading_stack:
+                    heading_stack[-1]["children"].append(heading)
+                else:
+                    headings.append(heading)
+                heading_stack.append(heading)
+        paragraph_index += 1
+
+    images = []
+    graphics = doc.getGraphicObjects()
+    for name in graphics.getElementNames():
+        graphic = graphics.getByName(name)
+        image_info = {"name": name, "anchor_type": str(graphic.AnchorType.value)}
+        try:
+            image_info["paragraph_index"] = find_paragraph_for_range(
+                text, paragraphs, graphic.getAnchor()
+            )
+        except Exception:
+            # Anchors inside tables, frames or headers are not in the body text
+            image_info["paragraph_index"] = None
+        images.append(image_info)
+
+    return {
+        "type": "text",
+        "paragraph_count": paragraph_index,
+        "headings": headings,
+        "table_count": len(tables),
+        "tables": tables,
+        "image_count": len(images),
+        "images": images,
+    }
+
+
+def build_presentation_outline(doc):
+    """Build an Impress outline with one pass over each slide's shapes."""
+    draw_pages = doc.getDrawPages()
+    slides = []
+    for slide_index in range(draw_pages.getCount()):
+        slide = draw_pages.getByIndex(slide_index)
+        shape_count = slide.getCount()
+        title = None
+        images = []
+        for shape_index in range(shape_count):
+            shape = slide.getByIndex(shape_index)
+            shape_type = shape.getShapeType()
+            if (
+                shape_type == "com.sun.star.presentation.TitleTextShape"
+                and title is None
+            ):
+                title = shape.getString()
+            elif shape_type in (
+                "com.sun.star.drawing.GraphicObjectShape",
+                "com.sun.star.presentation.GraphicObjectShape",
+            ):
+                size = shape.getSize()
+                images.append(
+                    {
+                        "shape_index": shape_index,
+                        "name": shape.Name,
+                        "width": size.Width,
+                        "height": size.Height,
+                    }
+                )
+        slides.append(
+            {
+                "slide_index": slide_index,
+                "title": title,
+                "layout": slide.Layout if hasattr(slide, "Layout") else None,
+                "shape_count": shape_count,
+                "images": images,
+            }
+        )
 
-            # Count paragraphs
-            paragraph_count = 0
-            enum = text.createEnumeration()
-            while enum.hasMoreElements():
-                paragraph_count += 1
-                enum.nextElement()
-            props["ParagraphCount"] = paragraph_count
+    return {"type": "presentation", "slide_count": len(slides), "slides": slides}
 
-        return json.dumps(props, indent=2)
+
+def get_outline(file_path):
+    """Return the document structure without reading its full text."""
+    outline = get_cached(file_path, "outline")
+    if outline is None:
+        with managed_document(file_path, read_only=True) as doc:
+            if hasattr(doc, "getText"):
+                outline = build_writer_outline(doc)
+            elif hasattr(doc, "getDrawPages"):
+                outline = build_presentation_outline(doc)
+            else:
+                raise HelperError("Document does not support outlines")
+        set_cached(file_path, "outline", outline)
+    return json.dumps(outline, indent=2)
 
 
 # Writer functions
 
 
-def extract_text(file_path):
-    """Extract text from a document."""
+# UNO cursor movement takes a 16-bit count, so long moves are split into steps
+MAX_CURSOR_STEP = 32767
+
+
+def move_cursor_right(cursor, count, expand):
+    """Move a text cursor right by count characters, returning False at the end of the text."""
+    while count > 0:
+        step = min(count, MAX_CURSOR_STEP)
+        if not cursor.goRight(step, expand):
+            return False
+        count -= step
+    return True
+
+
+def read_paragraph_range(text, start_paragraph=0, max_paragraphs=None):
+    """Read a range of top-level paragraphs, stopping as soon as the range is filled."""
+    if start_paragraph < 0:
+        raise HelperError(f"Paragraph index {start_paragraph} is out of range")
+    if max_paragraphs is not None and max_paragraphs <= 0:
+        raise HelperError("max_paragraphs must be a positive number")
+
+    paragraphs = []
+    paragraph_index = 0
+    enum = text.createEnumeration()
+    while enum.hasMoreElements():
+        if max_paragraphs is not None and len(paragraphs) >= max_paragraphs:
+            break
+        element = enum.nextElement()
+        if paragraph_index >= start_paragraph:
+            if element.supportsService("com.sun.star.text.TextTable"):
+                element_text = f"[Table: {element.getName()}]"
+            else:
+                element_text = element.getString()
+            paragraphs.append({"index": paragraph_index, "text": element_text})
+        paragraph_index += 1
+
+    has_more = enum.hasMoreElements()
+    end_paragraph = start_paragraph + len(paragraphs)
+    return {
+        "start_paragraph": start_paragraph,
+        "end_paragraph": end_paragraph,
+        "paragraphs": paragraphs,
+        "next_cursor": end_paragraph if has_more else None,
+    }
+
+
+def read_character_range(text, start_char=0, max_chars=None):
+    """Read a range of characters using a text cursor instead of copying the whole text."""
+    if start_char < 0:
+        raise HelperError(f"Character offset {start_char} is out of range")
+    if max_chars is not None and max_chars <= 0:
+        raise HelperError("max_chars must be a positive number")
+
+    cursor = text.createTextCursor()
+    cursor.gotoStart(False)
+    if not move_cursor_right(cursor, start_char, False):
+        return {
+            "start_char": start_char,
+            "text": "",
+            "next_cursor": None,
+        }
+
+    if max_chars is None:
+        cursor.gotoEnd(True)
+        reached_end = True
+    else:
+        reached_end = not move_cursor_right(cursor, max_chars, True)
+
+    has_more = False
+    if not reached_end:
+        # Probe one character past the selection to see if there is more to read
+        probe = text.createTextCursorByRange(cursor.getEnd())
+        has_more = probe.goRight(1, False)
+
+    return {
+        "start_char": start_char,
+        "text": cursor.getString(),
+        "next_cursor": start_char + max_chars if has_more else None,
+    }
+
+
+def extract_text(
+    file_path,
+    start_paragraph=None,
+    max_paragraphs=None,
+    start_char=None,
+    max_chars=None,
+):
+    """
+    Extract text from a document.
+
+    With no range arguments the whole text is returned. Otherwise a JSON object
+    is returned holding the requested paragraph or character range, with
+    next_cursor set to the start_paragraph/start_char of the following chunk
+    (or null when the end of the document has been reached).
+    """
     with managed_document(file_path, read_only=True) as doc:
-        if hasattr(doc, "getText"):
-            return doc.getText().getString()
-        else:
+        if not hasattr(doc, "getText"):
             raise HelperError("Document does not support text extraction")
 
+        text = doc.getText()
+
+        if start_paragraph is not None or max_paragraphs is not None:
+            result = read_paragraph_range(text, start_paragraph or 0, max_paragraphs)
+            return json.dumps(result, indent=2)
+
+        if start_char is not None or max_chars is not None:
+            result = read_character_range(text, start_char or 0, max_chars)
+            return json.dumps(result, indent=2)
+
+        return text.getString()
+
 
 def add_text(file_path, text, position="end"):
     """Add text to a document."""
@@ -324,7 +619,7 @@ def add_text(file_path, text, position="end"):
                 text_obj.insertString(text_obj.getEnd(), text, False)
 
             # Save document
-            doc.store()
+            store_document(doc)
             return f"Text added to {file_path}"
         else:
             raise HelperError("Document does not support text insertion")
@@ -333,127 +628,100 @@ def add_text(file_path, text, position="end"):
 def add_heading(file_path, text, level=1):
     """Add a heading to a document."""
     with managed_document(file_path) as doc:
-        if hasattr(doc, "getText"):
-            text_obj = doc.getText()
-            cursor = text_obj.createTextCursor()
-
-            # Add paragraph break
-            text_obj.insertControlCharacter(text_obj.getEnd(), PARAGRAPH_BREAK, False)
-
-            text_obj.insertString(text_obj.getEnd(), text, False)
-
-            # Move cursor to the added text
-            cursor.gotoEnd(False)
-            cursor.goLeft(len(text), True)  # Select the text
-
-            # Apply heading style
-            heading_style = f"Heading {level}"
-            if cursor.ParaStyleName != heading_style:
-                cursor.ParaStyleName = heading_style
-
-            # Add paragraph break
-            text_obj.insertControlCharacter(text_obj.getEnd(), PARAGRAPH_BREAK, False)
-
-            # Save document
-            doc.store()
-            return f"Heading added to {file_path}"
-        else:
+        if not hasattr(doc, "getText"):
             raise HelperError("Document does not support headings")
+        writer = start_document_writer(doc)
+        write_paragraph(writer, text, f"Heading {level}")
+
+        # Save document
+        store_document(doc)
+        return f"Heading added to {file_path}"
 
 
 def add_paragraph(file_path, text, style=None, alignment=None):
     """Add a paragraph with optional styling."""
     with managed_document(file_path) as doc:
-        if hasattr(doc, "getText"):
-            text_obj = doc.getText()
-            cursor = text_obj.createTextCursor()
-
-            # Go to the end of the document
-            cursor.gotoEnd(False)
-
-            # Insert the paragraph text
-            text_obj.insertString(cursor, text, False)
-
-            # Select the inserted text
-            cursor.gotoEnd(False)
-            cursor.goLeft(len(text), True)
-
-            # Apply style if specified
-            if style:
-                try:
-                    cursor.ParaStyleName = style
-                except Exception as style_error:
-                    raise HelperError(f"Error applying style: {style_error}")
-
-            # Apply alignment if specified
-            alignment_map = {
-                "left": LEFT,
-                "center": CENTER,
-                "right": RIGHT,
-                "justify": BLOCK,
-            }
-
-            if alignment and alignment.lower() in alignment_map:
-                cursor.ParaAdjust = alignment_map[alignment.lower()]
-
-            # Add paragraph break
-            text_obj.insertControlCharacter(text_obj.getEnd(), PARAGRAPH_BREAK, False)
-
-            # Save document
-            doc.store()
-            return f"Paragraph added to {file_path}"
-        else:
+        if not hasattr(doc, "getText"):
             raise HelperError("Document does not support paragraphs")
+        # Unknown alignments have always been ignored here
+        if alignment and alignment.lower() not in ALIGNMENT_MAP:
+            alignment = None
+        writer = start_document_writer(doc)
+        try:
+            write_paragraph(writer, text, style or "Standard", alignment)
+        except Exception as style_error:
+            raise HelperError(f"Error applying style: {style_error}")
+
+        # Save document
+        store_document(doc)
+        return f"Paragraph added to {file_path}"
+
+
+def build_char_properties(format_options):
+    """Return sorted (names, values) tuples for the requested character formatting."""
+    properties = {}
+    if format_options.get("bold"):
+        properties["CharWeight"] = 150.0
+    if format_options.get("italic"):
+        properties["CharPosture"] = ITALIC
+    if format_options.get("underline"):
+        properties["CharUnderline"] = 1
+    if format_options.get("color"):
+        color = format_options["color"]
+        if isinstance(color, str) and color.startswith("#"):
+            color = int(color[1:], 16)
+        properties["CharColor"] = color
+    if format_options.get("font"):
+        properties["CharFontName"] = format_options["font"]
+    if format_options.get("size"):
+        properties["CharHeight"] = float(format_options["size"])
+    names = tuple(sorted(properties))
+    return names, tuple(properties[name] for name in names)
+
+
+def configure_search(descriptor, search_text, options):
+    """Apply the search string and the regex, whole word and case options to a descriptor."""
+    descriptor.SearchString = search_text
+    descriptor.SearchCaseSensitive = bool(options.get("case_sensitive", False))
+    descriptor.SearchRegularExpression = bool(options.get("regex", False))
+    descriptor.SearchWords = bool(options.get("whole_word", False))
+    return descriptor
 
 
 def format_text(file_path, text_to_find, format_options):
-    """Format specific text in a document."""
+    """
+    Format specific text in a document.
+    All matches are collected with findAll and each gets the whole property
+    set in one setPropertyValues call. format_options may also hold regex,
+    whole_word and case_sensitive search options.
+    """
     with managed_document(file_path) as doc:
         if hasattr(doc, "getText"):
-            search = doc.createSearchDescriptor()
-            search.SearchString = text_to_find
-            search.SearchCaseSensitive = False
-
-            found = doc.findFirst(search)
-            found_count = 0
-
-            while found:
-                found_count += 1
-                # Apply formatting
-                if format_options.get("bold"):
-                    found.CharWeight = 150
-                if format_options.get("italic"):
-                    # Try to use the proper UNO constant first
-                    try:
-                        found.CharPosture = ITALIC
-                        logging.info(f"Set CharPosture to ITALIC constant: {ITALIC}")
-                    except ImportError:
-                        # Fallback to numeric value
-                        found.CharPosture = 2
-                        logging.info("Set CharPosture to numeric value 2")
-
-                    # Log what was actually set
-                    actual_posture = getattr(found, "CharPosture", "unknown")
-                    logging.info(
-                        f"Actual CharPosture value after setting: {actual_posture} (type: {type(actual_posture)})"
+            names, values = build_char_properties(format_options)
+
+            search = configure_search(
+                doc.createSearchDescriptor(), text_to_find, format_options
+            )
+            found = doc.findAll(search)
+            found_count = found.getCount()
+
+            multi_property = None
+            for index in range(found_count if names else 0):
+                found_range = found.getByIndex(index)
+                if multi_property is None:
+                    multi_property = hasattr(found_range, "setPropertyValues")
+                if not multi_property:
+                    # Plain ranges lack XMultiPropertySet; a cursor over them has it
+                    found_range = found_range.getText().createTextCursorByRange(
+                        found_range
                     )
+                found_range.setPropertyValues(names, values)
 
-                if format_options.get("underline"):
-                    found.CharUnderline = 1
-                if format_options.get("color"):
-                    color = format_options["color"]
-                    if isinstance(color, str) and color.startswith("#"):
-                        color = int(color[1:], 16)
-                    found.CharColor = color
-                if format_options.get("font"):
-                    found.CharFontName = format_options["font"]
-                if format_options.get("size"):
-                    found.CharHeight = float(format_options["size"])
-
-                # Find next occurrence
-                found = doc.findNext(found.End, search)
-
-            doc.store()
+            if found_count and names:
+                store_document(doc)
+            logging.info(
+                f"format_text applied {len(names)} properties to {found_count} matches"
+            )
             return f"Formatted {found_count} occurrences of '{text_to_find}' in {file_path}"
         else:
             raise HelperError("Document does not support text formatting")
@@ -463,35 +731,105 @@ def search_replace_text(file_path, search_text, replace_text):
     """Search and replace text throughout the document."""
     with managed_document(file_path) as doc:
         if hasattr(doc, "getText"):
-            text_obj = doc.getText()
-            document_text = text_obj.getString()
-
-            # Check if text exists in document
-            if search_text not in document_text:
-                raise HelperError(f"Text '{search_text}' not found in document")
-
             # Create replace descriptor
-            replace_desc = doc.createReplaceDescriptor()
-            replace_desc.SearchString = search_text
+            replace_desc = configure_search(
+                doc.createReplaceDescriptor(), search_text, {}
+            )
             replace_desc.ReplaceString = replace_text
-            replace_desc.SearchCaseSensitive = False
-            replace_desc.SearchWords = False
 
-            # Perform replacement
+            # Perform replacement; the count tells us whether the text was there
             count = doc.replaceAll(replace_desc)
+            if count == 0:
+                raise HelperError(f"Text '{search_text}' not found in document")
 
             # Save document
-            doc.store()
+            store_document(doc)
             return f"Replaced {count} occurrences of '{search_text}' with '{replace_text}' in {file_path}"
         else:
             raise HelperError("Document does not support search and replace")
 
 
+def search_replace_many(file_path, replacements):
+    """
+    Run several search and replace passes in one open/store cycle.
+    Args:
+        file_path: Path to the document.
+        replacements: List of entries, each either a dict with search, replace
+            and optional regex, whole_word and case_sensitive keys, or a
+            [search, replace, options] list.
+    Returns the number of replacements made for each pattern, in order.
+    """
+    if not replacements:
+        raise HelperError("No replacements provided")
+
+    entries = []
+    for entry in replacements:
+        if isinstance(entry, dict):
+            search_text = entry.get("search", "")
+            replace_text = entry.get("replace", "")
+            options = entry
+        elif isinstance(entry, (list, tuple)) and 2 <= len(entry) <= 3:
+            search_text, replace_text = entry[0], entry[1]
+            options = entry[2] if len(entry) == 3 else {}
+        else:
+            raise HelperError(f"Invalid replacement entry: {entry}")
+        if not search_text:
+            raise HelperError("Replacement entries need a search pattern")
+        entries.append((search_text, replace_text, options))
+
+    with managed_document(file_path) as doc:
+        if not hasattr(doc, "getText"):
+            raise HelperError("Document does not support search and replace")
+
+        replace_desc = doc.createReplaceDescriptor()
+        counts = []
+        for search_text, replace_text, options in entries:
+            configure_search(replace_desc, search_text, options)
+            replace_desc.ReplaceString = replace_text
+            counts.append(doc.replaceAll(replace_desc))
+
+        total = sum(counts)
+        if total:
+            store_document(doc)
+
+        summary = ", ".join(
+            f"'{search_text}': {count}"
+            for (search_text, _, _), count in zip(entries, counts)
+        )
+        return f"Made {total} replacements in {file_path} ({summary})"
+
+
 def delete_text(file_path, text_to_delete):
     """Delete specific text from the document."""
     return search_replace_text(file_path, text_to_delete, "")
 
 
+def fill_table(table, rows, columns, data=None, header_row=False):
+    """Populate an inserted table with one bulk write and bold its header row."""
+    # Populate the table with one bulk write over the data's cell range
+    if data:
+        try:
+            values = tuple(
+                tuple(str(value) for value in row_data[:columns])
+                + ("",) * (columns - len(row_data[:columns]))
+                for row_data in data[:rows]
+            )
+            table.getCellRangeByPosition(
+                0, 0, columns - 1, len(values) - 1
+            ).setDataArray(values)
+        except Exception as table_error:
+            raise HelperError(f"Error populating table: {str(table_error)}")
+
+    # Format header row if requested
+    if header_row and rows > 0:
+        try:
+            # Bold the whole first row with one property set
+            header_range = table.getCellRangeByPosition(0, 0, columns - 1, 0)
+            header_range.CharWeight = 150  # Bold
+        except Exception as header_error:
+            raise HelperError(f"Error formatting header row: {header_error}")
+
+
 def add_table(file_path, rows, columns, data=None, header_row=False):
     """Add a table to a document."""
     with managed_document(file_path) as doc:
@@ -505,43 +843,269 @@ def add_table(file_path, rows, columns, data=None, header_row=False):
             table.initialize(rows, columns)
             text.insertTextContent(cursor, table, False)
 
-            # Populate table if data is provided
-            if data:
-                try:
-                    for row_idx, row_data in enumerate(data):
-                        if row_idx >= rows:
-                            break
-                        for col_idx, cell_value in enumerate(row_data):
-                            if col_idx >= columns:
-                                break
-                            cell_name = chr(65 + col_idx) + str(
-                                row_idx + 1
-                            )  # A1, B1, etc.
-                            cell = table.getCellByName(cell_name)
-                            cell_text = cell.getText()
-                            cell_text.setString(str(cell_value))
-                except Exception as table_error:
-                    raise HelperError(f"Error populating table: {str(table_error)}")
-
-            # Format header row if requested
-            if header_row and rows > 0:
-                try:
-                    # Format cells in first row as bold
-                    for col_idx in range(columns):
-                        cell_name = chr(65 + col_idx) + "1"  # A1, B1, etc.
-                        cell = table.getCellByName(cell_name)
-                        cursor = cell.getText().createTextCursor()
-                        cursor.gotoStart(False)
-                        cursor.gotoEnd(True)
-                        cursor.CharWeight = 150  # Bold
-                except Exception as header_error:
-                    raise HelperError(f"Error formatting header row: {header_error}")
+            fill_table(table, rows, columns, data, header_row)
 
             # Save document
-            doc.store()
+            store_document(doc)
             return f"Table added to {file_path}"
 
 
+# Rows written per setDataArray call when importing delimited files
+IMPORT_CHUNK_ROWS = 500
+
+
+def is_number(value):
+    """Return True if a cell value reads as a number (thousands separators allowed)."""
+    try:
+        float(value.replace(",", ""))
+        return True
+    except ValueError:
+        return False
+
+
+# Encodings tried in order; Excel on Windows saves CSV files as cp1252
+DELIMITED_FILE_ENCODINGS = ["utf-8-sig", "cp1252"]
+
+
+def open_delimited_file(data_path, delimiter, encoding):
+    """Open a CSV/TSV file for streaming, returning (file, reader)."""
+    f = open(data_path, newline="", encoding=encoding)
+    return f, csv.reader(f, delimiter=delimiter)
+
+
+def scan_delimited_file(data_path, delimiter, encoding, row_limit, header_row):
+    """Count the rows and columns of a CSV/TSV file and find its numeric columns."""
+    rows = 0
+    columns = 0
+    numeric = {}
+    f, reader = open_delimited_file(data_path, delimiter, encoding)
+    with f:
+        for row_data in reader:
+            if row_limit is not None and rows >= row_limit:
+                break
+            rows += 1
+            columns = max(columns, len(row_data))
+            if header_row and rows == 1:
+                continue
+            for col_idx, value in enumerate(row_data):
+                value = value.strip()
+                if value and numeric.get(col_idx, True):
+                    numeric[col_idx] = is_number(value)
+    return rows, columns, numeric
+
+
+def import_table(
+    file_path,
+    data_path,
+    delimiter=None,
+    header_row=True,
+    max_rows=None,
+    align_numbers=True,
+):
+    """
+    Build a Writer table at the end of a document from a CSV or TSV file.
+
+    The file is read twice as a stream: once to size the table and find the
+    numeric columns, then again to write the rows in chunks of
+    IMPORT_CHUNK_ROWS with one setDataArray call each, so the data never has
+    to be held in memory or passed through the command.
+
+    Args:
+        file_path: Path to the Writer document.
+        data_path: Path to the CSV or TSV file.
+        delimiter: Field delimiter; defaults to a tab for .tsv/.tab files and
+            a comma otherwise.
+        header_row: Treat the first row as a bold, repeated header.
+        max_rows: Maximum number of data rows to import (header excluded).
+        align_numbers: Right-align columns whose values are all numeric.
+    """
+    data_path = normalize_path(data_path)
+    if not os.path.exists(data_path):
+        raise HelperError(f"Data file not found: {data_path}")
+    if delimiter is None:
+        delimiter = "\t" if data_path.lower().endswith((".tsv", ".tab")) else ","
+    row_limit = None if max_rows is None else max_rows + (1 if header_row else 0)
+
+    # First pass: count rows and columns, find numeric columns and settle on
+    # the first encoding the whole file decodes with
+    data_name = os.path.basename(data_path)
+    for encoding in DELIMITED_FILE_ENCODINGS:
+        try:
+            rows, columns, numeric = scan_delimited_file(
+                data_path, delimiter, encoding, row_limit, header_row
+            )
+            break
+        except UnicodeDecodeError as decode_error:
+            logging.info(f"{data_name} is not {encoding}: {decode_error}")
+        except csv.Error as csv_error:
+            raise HelperError(f"Could not parse {data_name}: {csv_error}")
+    else:
+        raise HelperError(
+            f"Could not decode {data_name} as any of {DELIMITED_FILE_ENCODINGS}"
+        )
+
+    if rows == 0 or columns == 0:
+        raise HelperError(f"No rows found in {data_path}")
+
+    with managed_document(file_path) as doc:
+        if not hasattr(doc, "getText"):
+            raise HelperError("Document does not support tables")
+        text = doc.getText()
+        cursor = text.createTextCursor()
+        cursor.gotoEnd(False)  # Move to end of document
+
+        table = doc.createInstance("com.sun.star.text.TextTable")
+        table.initialize(rows, columns)
+        text.insertTextContent(cursor, table, False)
+
+        # Second pass: write the rows in chunks
+        f, reader = open_delimited_file(data_path, delimiter, encoding)
+        with f:
+            chunk = []
+            top = 0
+            for row_data in reader:
+                if top + len(chunk) >= rows:
+                    break
+                chunk.append(
+                    tuple(row_data[:columns]) + ("",) * (columns - len(row_data))
+                )
+                if len(chunk) == IMPORT_CHUNK_ROWS:
+                    table.getCellRangeByPosition(
+                        0, top, columns - 1, top + len(chunk) - 1
+                    ).setDataArray(tuple(chunk))
+                    top += len(chunk)
+                    chunk = []
+            if chunk:
+                table.getCellRangeByPosition(
+                    0, top, columns - 1, top + len(chunk) - 1
+                ).setDataArray(tuple(chunk))
+
+        first_data_row = 1 if header_row else 0
+        if header_row:
+            table.getCellRangeByPosition(0, 0, columns - 1, 0).CharWeight = 150
+            table.RepeatHeadline = True
+
+        numeric_columns = [col_idx for col_idx, flag in numeric.items() if flag]
+        if align_numbers and rows > first_data_row:
+            for col_idx in numeric_columns:
+                table.getCellRangeByPosition(
+                    col_idx, first_data_row, col_idx, rows - 1
+                ).ParaAdjust = RIGHT
+
+        # Save document
+        store_document(doc)
+        return f"Imported {rows - first_data_row} rows and {columns} columns from {os.path.basename(data_path)} into a table in {file_path}"
+
+
+HEADER_ROW_COLOR = 13421772  # Light gray
+ZEBRA_ROW_COLOR = 15921906  # Very light gray
+
+
+def parse_color(color):
+    """Accept colors as integers or "#RRGGBB" strings."""
+    if isinstance(color, str) and color.startswith("#"):
+        return int(color[1:], 16)
+    return color
+
+
+def build_table_border(border_width):
+    """Build a TableBorder2 with the same solid black line on every edge."""
+    width_in_hundredths_mm = int(int(border_width) * 35.28)
+    logging.info(
+        f"Setting border width: {border_width} points = {width_in_hundredths_mm} 1/100mm"
+    )
+
+    # Create border line
+    border_line = BorderLine2()
+    border_line.LineWidth = width_in_hundredths_mm
+    border_line.LineStyle = SOLID
+    border_line.Color = 0  # Black color
+
+    table_border = TableBorder2()
+    for edge in ("Top", "Bottom", "Left", "Right", "Horizontal", "Vertical"):
+        setattr(table_border, f"{edge}Line", border_line)
+        setattr(table_border, f"Is{edge}LineValid", True)
+    return table_border
+
+
+def column_separators(table, column_widths):
+    """Convert relative column widths into TableColumnSeparators positions."""
+    separators = table.TableColumnSeparators
+    if len(column_widths) != len(separators) + 1:
+        raise HelperError(
+            f"Expected {len(separators) + 1} column widths, got {len(column_widths)}"
+        )
+    relative_sum = table.TableColumnRelativeSum
+    total = float(sum(column_widths))
+    position = 0.0
+    for separator, width in zip(separators, column_widths[:-1]):
+        position += width
+        separator.Position = int(relative_sum * position / total)
+    return separators
+
+
+def apply_table_format(table, format_options, table_border=None):
+    """
+    Apply a format spec to one table with cell-range property sets.
+    table_border is a prebuilt TableBorder2, so it can be shared between tables.
+    """
+    columns = table.getColumns().getCount()
+    rows = table.getRows().getCount()
+
+    # Apply table formatting options
+    if table_border is not None:
+        try:
+            table.setPropertyValue("TableBorder2", table_border)
+        except Exception as border_error:
+            logging.error(f"Border formatting error: {border_error}")
+            raise HelperError(f"Error applying table borders: {border_error}")
+
+    if "background_color" in format_options:
+        try:
+            table.BackColor = parse_color(format_options["background_color"])
+        except Exception as color_error:
+            raise HelperError(f"Error applying table background color: {color_error}")
+
+    # Stripe every other data row
+    if format_options.get("zebra"):
+        try:
+            zebra_color = parse_color(
+                format_options.get("zebra_color", ZEBRA_ROW_COLOR)
+            )
+            first_row = 1 if format_options.get("header_row") else 0
+            for row_idx in range(first_row + 1, rows, 2):
+                table.getCellRangeByPosition(
+                    0, row_idx, columns - 1, row_idx
+                ).BackColor = zebra_color
+        except Exception as zebra_error:
+            raise HelperError(f"Error applying zebra striping: {zebra_error}")
+
+    # Format the header row as one cell range
+    if "header_row" in format_options:
+        try:
+            header_range = table.getCellRangeByPosition(0, 0, columns - 1, 0)
+            if format_options["header_row"]:
+                header_range.BackColor = parse_color(
+                    format_options.get("header_color", HEADER_ROW_COLOR)
+                )
+                header_range.CharWeight = 150  # Bold
+            else:
+                header_range.BackColor = 16777215  # White
+                header_range.CharWeight = 100  # Normal
+        except Exception as header_error:
+            raise HelperError(f"Error formatting header row: {header_error}")
+
+    if format_options.get("column_widths"):
+        try:
+            table.TableColumnSeparators = column_separators(
+                table, format_options["column_widths"]
+            )
+        except HelperError:
+            raise
+        except Exception as width_error:
+            raise HelperError(f"Error setting column widths: {width_error}")
+
+
 def format_table(file_path, table_index, format_options):
     """Format a table with borders, shading, etc."""
     with managed_document(file_path) as doc:
@@ -555,82 +1119,160 @@ def format_table(file_path, table_index, format_options):
             )
 
         table = tables.getByIndex(table_index)
-
-        # Apply table formatting options
+        table_border = None
         if "border_width" in format_options:
-            try:
-                width = int(format_options["border_width"])
-                width_in_hundredths_mm = int(width * 35.28)
+            table_border = build_table_border(format_options["border_width"])
+        apply_table_format(table, format_options, table_border)
 
-                logging.info(
-                    f"Setting border width: {width} points = {width_in_hundredths_mm} 1/100mm"
-                )
+        # Save document
+        store_document(doc)
+        return f"Table formatted in {file_path}"
 
-                # Create border line
-                border_line = BorderLine2()
-                border_line.LineWidth = width_in_hundredths_mm
-                border_line.LineStyle = SOLID
-                border_line.Color = 0  # Black color
-
-                table_border_2 = table.getPropertyValue("TableBorder2")
-                table_border_2.TopLine = border_line
-                table_border_2.BottomLine = border_line
-                table_border_2.LeftLine = border_line
-                table_border_2.RightLine = border_line
-                table_border_2.HorizontalLine = border_line
-                table_border_2.VerticalLine = border_line
-                table.setPropertyValue("TableBorder2", table_border_2)
-
-            except Exception as border_error:
-                logging.error(f"Border formatting error: {border_error}")
-                raise HelperError(f"Error applying table borders: {border_error}")
-
-        if "background_color" in format_options:
-            try:
-                color = format_options["background_color"]
-                if isinstance(color, str) and color.startswith("#"):
-                    color = int(color[1:], 16)
-                table.BackColor = color
-            except Exception as color_error:
+
+def format_tables(file_path, format_options, table_indices=None):
+    """
+    Apply one format spec to several tables in one open/store cycle.
+    Args:
+        file_path: Path to the document.
+        format_options: Dict with any of border_width, background_color,
+            header_row, header_color, zebra, zebra_color and column_widths
+            (relative widths, one per column).
+        table_indices: Indices of the tables to format; all tables if None.
+    """
+    with managed_document(file_path) as doc:
+        if not hasattr(doc, "getTextTables"):
+            raise HelperError("Document does not support table formatting")
+
+        tables = doc.getTextTables()
+        table_count = tables.getCount()
+        if table_indices is None:
+            table_indices = list(range(table_count))
+        for table_index in table_indices:
+            if table_index < 0 or table_index >= table_count:
                 raise HelperError(
-                    f"Error applying table background color: {color_error}"
+                    f"Table index {table_index} is out of range (document has {table_count} tables)"
                 )
+        if not table_indices:
+            raise HelperError("No tables found in document")
 
-        # Format specific rows if requested
-        if "header_row" in format_options:
-            try:
-                if format_options["header_row"]:
-                    row = table.getRows().getByIndex(0)
-                    row.BackColor = 13421772  # Light gray
-
-                    # Format header cells
-                    for col_idx in range(table.getColumns().getCount()):
-                        cell = table.getCellByPosition(col_idx, 0)
-                        cursor = cell.getText().createTextCursor()
-                        cursor.gotoStart(False)
-                        cursor.gotoEnd(True)
-                        cursor.CharWeight = 150  # Bold
-                else:
-                    row = table.getRows().getByIndex(0)
-                    row.BackColor = 16777215  # White
-
-                    # Format header cells
-                    for col_idx in range(table.getColumns().getCount()):
-                        cell = table.getCellByPosition(col_idx, 0)
-                        cursor = cell.getText().createTextCursor()
-                        cursor.gotoStart(False)
-                        cursor.gotoEnd(True)
-                        cursor.CharWeight = 100  # Normal
-            except Exception as header_error:
-                raise HelperError(f"Error formatting header row: {header_error}")
+        # Build the border struct once for every table
+        table_border = None
+        if "border_width" in format_options:
+            table_border = build_table_border(format_options["border_width"])
+
+        for table_index in table_indices:
+            apply_table_format(
+                tables.getByIndex(table_index), format_options, table_border
+            )
 
         # Save document
-        doc.store()
-        return f"Table formatted in {file_path}"
+        store_document(doc)
+        return f"Formatted {len(table_indices)} tables in {file_path}"
+
+
+def fit_size(width, height, natural_width, natural_height):
+    """Return a Size for the requested width and/or height, keeping the aspect ratio."""
+    if width is not None and height is not None:
+        return Size(width, height)
+    if width is not None:
+        return Size(width, int(width * natural_height / natural_width))
+    return Size(int(height * natural_width / natural_height), height)
+
+
+def get_text_area_size(doc, position):
+    """Return the text area size of the page style at position, in 1/100mm."""
+    try:
+        page_style = (
+            doc.getStyleFamilies()
+            .getByName("PageStyles")
+            .getByName(position.PageStyleName)
+        )
+    except Exception as style_error:
+        logging.info(f"Could not read the page style: {style_error}")
+        return None
+    width = page_style.Width - page_style.LeftMargin - page_style.RightMargin
+    height = page_style.Height - page_style.TopMargin - page_style.BottomMargin
+    if page_style.HeaderIsOn:
+        height -= page_style.HeaderHeight
+    if page_style.FooterIsOn:
+        height -= page_style.FooterHeight
+    if width <= 0 or height <= 0:
+        return None
+    return width, height
+
+
+def create_graphic_object(
+    doc, image_path, width=None, height=None, optimize_dpi=None, position=None
+):
+    """
+    Create a character-anchored TextGraphicObject sized from the image header.
+
+    Without an explicit width or height the natural size is scaled down, if
+    needed, to fit the text area of the page at position.
+    """
+    graphic = None
+    info = get_image_info(image_path)
+    if info:
+        natural_width, natural_height = image_size_100mm(info)
+    else:
+        # Unknown header: ask the loaded graphic for its size instead
+        graphic = load_graphic(image_path)
+        natural_size = graphic.Size100thMM
+        natural_width, natural_height = natural_size.Width, natural_size.Height
+        if natural_width <= 0 or natural_height <= 0:
+            # Pixel graphics without a map mode report no logical size
+            pixel_size = graphic.SizePixel
+            natural_width = int(pixel_size.Width * 2540 / DEFAULT_DPI)
+            natural_height = int(pixel_size.Height * 2540 / DEFAULT_DPI)
+
+    size = None
+    if natural_width > 0 and natural_height > 0:
+        if width is not None or height is not None:
+            size = fit_size(width, height, natural_width, natural_height)
+        else:
+            size = Size(natural_width, natural_height)
+            text_area = get_text_area_size(doc, position) if position else None
+            if text_area:
+                scale = min(
+                    1, text_area[0] / natural_width, text_area[1] / natural_height
+                )
+                size = Size(int(natural_width * scale), int(natural_height * scale))
+    elif width is not None and height is not None:
+        size = Size(width, height)
+
+    # Only images with a readable header are optimized, so a graphic loaded
+    # above never needs replacing
+    if size and optimize_dpi:
+        # Resample for the size the image is shown at, not its natural size
+        logging.info(
+            f"Optimizing {image_path} for {size.Width}x{size.Height} (1/100mm) at {optimize_dpi} dpi"
+        )
+        image_path = optimize_image(image_path, size.Width, size.Height, optimize_dpi)
+
+    graphic_object = doc.createInstance("com.sun.star.text.TextGraphicObject")
+    graphic_object.Graphic = graphic or load_graphic(image_path)
+    graphic_object.AnchorType = AS_CHARACTER
+    if size:
+        graphic_object.Width = size.Width
+        graphic_object.Height = size.Height
+    return graphic_object
 
 
-def insert_image(file_path, image_path, width=None, height=None):
-    """Insert an image into a document using dispatch."""
+def insert_image(
+    file_path,
+    image_path,
+    width=None,
+    height=None,
+    optimize_dpi=None,
+    paragraph_index=None,
+):
+    """
+    Insert an image into a Writer document as a graphic object.
+    The image is anchored as a character at the start of the given paragraph,
+    or in a new paragraph at the end of the document. No view is needed.
+    If optimize_dpi is set, the image is resampled for its display size first;
+    without an explicit size that is its natural size fitted to the page.
+    """
     with managed_document(file_path) as doc:
         # Normalize image path
         image_path = normalize_path(image_path)
@@ -640,92 +1282,38 @@ def insert_image(file_path, image_path, width=None, height=None):
         if not os.path.exists(image_path):
             raise HelperError(f"Image not found: {image_path}")
 
-        # Get component context and necessary services
-        ctx = uno.getComponentContext()
-        smgr = ctx.ServiceManager
-
-        # Create dispatch helper for UNO commands
-        dispatcher = smgr.createInstanceWithContext(
-            "com.sun.star.frame.DispatchHelper", ctx
-        )
-
-        # Get frame from document controller
-        frame = doc.getCurrentController().getFrame()
-
-        # Create properties for InsertGraphic command
-        props = []
-
-        # Add filename property - convert to URL format
-        filename_prop = PropertyValue()
-        filename_prop.Name = "FileName"
-        filename_prop.Value = uno.systemPathToFileUrl(image_path)
-        props.append(filename_prop)
-
-        # Add AsLink property
-        aslink_prop = PropertyValue()
-        aslink_prop.Name = "AsLink"
-        aslink_prop.Value = False  # Set to True if you want to link instead of embed
-        props.append(aslink_prop)
+        if not hasattr(doc, "getText"):
+            raise HelperError("Document does not support text insertion")
+        text = doc.getText()
 
-        # Execute the InsertGraphic command
-        dispatcher.executeDispatch(frame, ".uno:InsertGraphic", "", 0, tuple(props))
+        # Resolve the insertion point before changing anything
+        if paragraph_index is not None:
+            paragraph = collect_paragraphs(text, [paragraph_index]).get(paragraph_index)
+            if paragraph is None:
+                raise HelperError(f"Paragraph index {paragraph_index} is out of range")
+            if paragraph.supportsService("com.sun.star.text.TextTable"):
+                raise HelperError(
+                    f"Paragraph index {paragraph_index} is a table, not a paragraph"
+                )
+            cursor = text.createTextCursorByRange(paragraph.getStart())
+        else:
+            if text.compareRegionStarts(text.getStart(), text.getEnd()) != 0:
+                text.insertControlCharacter(text.getEnd(), PARAGRAPH_BREAK, False)
+            cursor = text.createTextCursorByRange(text.getEnd())
 
-        # Optional: Resize the image if width/height provided
-        if width is not None or height is not None:
-            # Try to get the inserted image as the current selection
-            current_selection = doc.getCurrentController().getSelection()
-            if (
-                current_selection
-                and hasattr(current_selection, "getCount")
-                and current_selection.getCount() > 0
-            ):
-                shape = current_selection.getByIndex(0)
-
-                # Calculate new size preserving aspect ratio
-                if width is not None and height is not None:
-                    # Use both dimensions as provided
-                    size = Size(width, height)
-                    shape.setSize(size)
-                elif width is not None:
-                    # Maintain aspect ratio based on width
-                    ratio = shape.Size.Height / shape.Size.Width
-                    new_height = int(width * ratio)
-                    shape.setSize(Size(width, new_height))
-                elif height is not None:
-                    # Maintain aspect ratio based on height
-                    ratio = shape.Size.Width / shape.Size.Height
-                    new_width = int(height * ratio)
-                    shape.setSize(Size(new_width, height))
-            elif current_selection:
-                # Try alternative approach for Writer documents
-                try:
-                    # For Writer, the selection might be a TextGraphicObject
-                    if hasattr(current_selection, "getImplementationName"):
-                        impl_name = current_selection.getImplementationName()
-                        if (
-                            "TextGraphicObject" in impl_name
-                            or "GraphicObject" in impl_name
-                        ):
-                            shape = current_selection
-
-                            # Calculate new size preserving aspect ratio
-                            if width is not None and height is not None:
-                                size = Size(width, height)
-                                shape.setSize(size)
-                            elif width is not None:
-                                ratio = shape.Size.Height / shape.Size.Width
-                                new_height = int(width * ratio)
-                                shape.setSize(Size(width, new_height))
-                            elif height is not None:
-                                ratio = shape.Size.Width / shape.Size.Height
-                                new_width = int(height * ratio)
-                                shape.setSize(Size(new_width, height))
-                except Exception as resize_error:
-                    logging.warning(f"Could not resize image: {resize_error}")
+        graphic_object = create_graphic_object(
+            doc, image_path, width, height, optimize_dpi, cursor
+        )
+        text.insertTextContent(cursor, graphic_object, False)
 
         # Save document
-        doc.store()
-        return f"Image inserted into {file_path}"
+        store_document(doc)
+        position = (
+            f"paragraph {paragraph_index}"
+            if paragraph_index is not None
+            else "end of document"
+        )
+        return f"Image inserted into {file_path} at {position}"
 
 
 def insert_page_break(file_path):
@@ -743,19 +1331,264 @@ def insert_page_break(file_path):
             cursor.BreakType = PAGE_BEFORE
 
             # Save document
-            doc.store()
+            store_document(doc)
             return f"Page break inserted in {file_path}"
 
 
-# DISABLED - not currently functioning
-# def create_custom_style(file_path, style_name, style_properties):
-#     """Create a custom paragraph style."""
-#     with managed_document(file_path) as doc:
-#         # Check if document supports styles
-#         if not hasattr(doc, "StyleFamilies"):
-#             raise HelperError("Document does not support custom styles")
+DOCUMENT_BLOCK_TYPES = [
+    "heading",
+    "paragraph",
+    "bullet_list",
+    "numbered_list",
+    "table",
+    "image",
+    "page_break",
+]
+
+# Paragraph attributes a new paragraph would otherwise inherit from the one it
+# was split from
+INHERITED_PARAGRAPH_PROPERTIES = (
+    "BreakType",
+    "NumberingLevel",
+    "NumberingStyleName",
+    "ParaAdjust",
+)
 
-#         # Get paragraph styles
+
+def start_document_writer(doc):
+    """Return the state for appending blocks to a document through one cursor."""
+    text = doc.getText()
+    cursor = text.createTextCursorByRange(text.getEnd())
+    return {
+        "doc": doc,
+        "text": text,
+        "cursor": cursor,
+        # An empty last paragraph, as in a new document, is written into
+        "paragraph_used": not cursor.isStartOfParagraph(),
+        "page_break": False,
+    }
+
+
+def start_paragraph(writer, style="Standard", alignment=None):
+    """Move the writer into a fresh paragraph with the given style."""
+    text, cursor = writer["text"], writer["cursor"]
+    if writer["paragraph_used"]:
+        text.insertControlCharacter(cursor, PARAGRAPH_BREAK, False)
+    writer["paragraph_used"] = True
+    cursor.setPropertiesToDefault(INHERITED_PARAGRAPH_PROPERTIES)
+    cursor.ParaStyleName = style
+    if alignment:
+        if alignment.lower() not in ALIGNMENT_MAP:
+            raise HelperError(f"Unknown alignment '{alignment}'")
+        cursor.ParaAdjust = ALIGNMENT_MAP[alignment.lower()]
+    if writer["page_break"]:
+        cursor.BreakType = PAGE_BEFORE
+        writer["page_break"] = False
+
+
+def write_paragraph(writer, text, style="Standard", alignment=None):
+    """Write one paragraph of text in the given style and alignment."""
+    start_paragraph(writer, style, alignment)
+    writer["text"].insertString(writer["cursor"], text, False)
+
+
+def write_table(writer, data, header_row=False):
+    """Write a table filled with data, a list of rows."""
+    rows = len(data)
+    columns = max(len(row_data) for row_data in data)
+    # The table goes in front of the empty paragraph, which stays free for
+    # the next block, so a pending page break belongs on the table itself
+    page_break = writer["page_break"]
+    writer["page_break"] = False
+    start_paragraph(writer)
+    table = writer["doc"].createInstance("com.sun.star.text.TextTable")
+    table.initialize(rows, columns)
+    writer["text"].insertTextContent(writer["cursor"], table, False)
+    if page_break:
+        table.BreakType = PAGE_BEFORE
+    writer["paragraph_used"] = False
+    fill_table(table, rows, columns, data, header_row)
+
+
+def write_image(writer, image_path, width=None, height=None, optimize_dpi=None):
+    """Write an image in a paragraph of its own, sized as in create_graphic_object."""
+    start_paragraph(writer)
+    graphic_object = create_graphic_object(
+        writer["doc"], image_path, width, height, optimize_dpi, writer["cursor"]
+    )
+    writer["text"].insertTextContent(writer["cursor"], graphic_object, False)
+
+
+# Numbering styles for lists; older LibreOffice versions name them differently
+BULLET_LIST_STYLES = ["List 1"]
+NUMBERED_LIST_STYLES = ["Numbering 123", "Numbering 1"]
+MAX_LIST_LEVEL = 9
+
+
+def list_style_name(doc, numbered):
+    """Return the first available bullet or numbering list style."""
+    numbering_styles = doc.getStyleFamilies().getByName("NumberingStyles")
+    candidates = NUMBERED_LIST_STYLES if numbered else BULLET_LIST_STYLES
+    for style_name in candidates:
+        if numbering_styles.hasByName(style_name):
+            return style_name
+    raise HelperError(f"No list style found (tried {candidates})")
+
+
+def flatten_list_items(items, level=0):
+    """
+    Yield (text, level) for list items. An item is a string, a dict with text,
+    optional level and nested items, or a list holding the nested items of the
+    item before it.
+    """
+    for item in items:
+        if isinstance(item, (list, tuple)):
+            yield from flatten_list_items(item, level + 1)
+        elif isinstance(item, dict):
+            item_level = int(item.get("level", level))
+            yield str(item.get("text", "")), item_level
+            yield from flatten_list_items(item.get("items", []), item_level + 1)
+        else:
+            yield str(item), level
+
+
+def write_list(writer, items, numbered=False):
+    """Write a whole list, applying the list style once over its range."""
+    entries = list(flatten_list_items(items))
+    if not entries:
+        raise HelperError("No list items provided")
+    for text, level in entries:
+        if level < 0 or level > MAX_LIST_LEVEL:
+            raise HelperError(
+                f"List level {level} is out of range (0-{MAX_LIST_LEVEL})"
+            )
+    style_name = list_style_name(writer["doc"], numbered)
+
+    list_range = None
+    for text, level in entries:
+        write_paragraph(writer, text)
+        if list_range is None:
+            list_range = writer["text"].createTextCursorByRange(writer["cursor"])
+            list_range.gotoStartOfParagraph(False)
+    list_range.gotoRange(writer["cursor"], True)
+    list_range.NumberingStyleName = style_name
+
+    # Set every level, top-level items included, so none is carried over from
+    # the paragraph the list was split from
+    paragraphs = list_range.createEnumeration()
+    for _, level in entries:
+        paragraphs.nextElement().NumberingLevel = level
+    return len(entries)
+
+
+def add_list(file_path, items, numbered=False):
+    """
+    Add a bullet or numbered list, with optional nesting, to the end of a document.
+    Args:
+        file_path: Path to the document.
+        items: List items; see flatten_list_items for nesting.
+        numbered: Use a numbering style instead of bullets.
+    """
+    with managed_document(file_path) as doc:
+        if not hasattr(doc, "getText"):
+            raise HelperError("Document does not support lists")
+
+        writer = start_document_writer(doc)
+        count = write_list(writer, items, numbered)
+
+        # Save document
+        store_document(doc)
+        return f"Added a {'numbered' if numbered else 'bullet'} list of {count} items to {file_path}"
+
+
+def finish_document_writer(writer):
+    # A trailing page break still needs a paragraph to start the new page
+    if writer["page_break"]:
+        start_paragraph(writer)
+
+
+def build_document(file_path, blocks):
+    """
+    Append a structured sequence of blocks to a Writer document in one
+    open/store cycle, writing everything through a single cursor.
+
+    Each block is a dict with a type and its own keys:
+        - heading: text, level (default 1)
+        - paragraph: text, style, alignment
+        - bullet_list, numbered_list: items (see flatten_list_items)
+        - table: data (list of rows), header_row
+        - image: image_path, width, height, optimize_dpi
+        - page_break
+    """
+    if not blocks:
+        raise HelperError("No blocks provided")
+
+    # Validate every block before touching the document
+    for block_index, block in enumerate(blocks):
+        block_type = block.get("type") if isinstance(block, dict) else None
+        if block_type not in DOCUMENT_BLOCK_TYPES:
+            raise HelperError(
+                f"Block {block_index} has unknown type '{block_type}'. Choose from: {DOCUMENT_BLOCK_TYPES}"
+            )
+        if block_type == "table" and not block.get("data"):
+            raise HelperError(f"Table block {block_index} has no data")
+        if block_type == "image":
+            image_path = normalize_path(block.get("image_path", ""))
+            if not image_path or not os.path.exists(image_path):
+                raise HelperError(
+                    f"Image not found in block {block_index}: {image_path}"
+                )
+
+    with managed_document(file_path) as doc:
+        if not hasattr(doc, "getText"):
+            raise HelperError("Document does not support text insertion")
+
+        writer = start_document_writer(doc)
+        for block in blocks:
+            block_type = block["type"]
+            if block_type == "heading":
+                write_paragraph(
+                    writer, block.get("text", ""), f"Heading {block.get('level', 1)}"
+                )
+            elif block_type == "paragraph":
+                write_paragraph(
+                    writer,
+                    block.get("text", ""),
+                    block.get("style") or "Standard",
+                    block.get("alignment"),
+                )
+            elif block_type in ("bullet_list", "numbered_list"):
+                write_list(
+                    writer, block.get("items", []), block_type == "numbered_list"
+                )
+            elif block_type == "table":
+                write_table(writer, block["data"], block.get("header_row", False))
+            elif block_type == "image":
+                write_image(
+                    writer,
+                    normalize_path(block["image_path"]),
+                    block.get("width"),
+                    block.get("height"),
+                    block.get("optimize_dpi"),
+                )
+            else:
+                writer["page_break"] = True
+        finish_document_writer(writer)
+
+        # Save document
+        store_document(doc)
+        return f"Added {len(blocks)} blocks to {file_path}"
+
+
+# DISABLED - not currently functioning
+# def create_custom_style(file_path, style_name, style_properties):
+#     """Create a custom paragraph style."""
+#     with managed_document(file_path) as doc:
+#         # Check if document supports styles
+#         if not hasattr(doc, "StyleFamilies"):
+#             raise HelperError("Document does not support custom styles")
+
+#         # Get paragraph styles
 #         para_styles = doc.StyleFamilies.getByName("ParagraphStyles")
 
 #         # Create new style or modify existing style
@@ -797,76 +1630,172 @@ def insert_page_break(file_path):
 #         return f"Custom style '{style_name}' created/updated in {file_path}"
 
 
+def resolve_paragraph_indices(paragraph_index, paragraph_count):
+    """
+    Normalise a paragraph selection to a sorted list of unique indices.
+
+    Accepts a single index, a list of indices, or a range given as
+    {"start": first, "end": last} (inclusive). Every index must be below
+    paragraph_count; ranges are checked before they are expanded.
+    """
+
+    def check(index):
+        if index < 0 or index >= paragraph_count:
+            raise HelperError(
+                f"Paragraph index {index} is out of range (document has {paragraph_count} paragraphs)"
+            )
+
+    if isinstance(paragraph_index, dict):
+        if "start" not in paragraph_index or "end" not in paragraph_index:
+            raise HelperError("Paragraph range must have 'start' and 'end' indices")
+        start = int(paragraph_index["start"])
+        end = int(paragraph_index["end"])
+        if end < start:
+            raise HelperError(f"Invalid paragraph range {start}-{end}")
+        check(start)
+        check(end)
+        return list(range(start, end + 1))
+    if isinstance(paragraph_index, (list, tuple)):
+        if not paragraph_index:
+            raise HelperError("No paragraph indices provided")
+        indices = sorted({int(index) for index in paragraph_index})
+    else:
+        indices = [int(paragraph_index)]
+    for index in indices:
+        check(index)
+    return indices
+
+
 def delete_paragraph(file_path, paragraph_index):
-    """Delete a paragraph at the given index."""
+    """Delete the paragraph(s) at the given index, list of indices or range."""
+    entries = get_cached(file_path, "paragraph_index")
+
+    # With a cached index bad requests fail before the document is even loaded
+    if entries is not None:
+        indices = resolve_paragraph_indices(paragraph_index, len(entries))
+
     with managed_document(file_path) as doc:
         if hasattr(doc, "getText"):
             text = doc.getText()
 
-            # Get all paragraphs
-            paragraphs = []
-            enum = text.createEnumeration()
-            while enum.hasMoreElements():
-                paragraphs.append(enum.nextElement())
-
-            # Check if index is valid
-            if paragraph_index < 0 or paragraph_index >= len(paragraphs):
-                raise HelperError(
-                    f"Paragraph index {paragraph_index} is out of range (document has {len(paragraphs)} paragraphs)"
-                )
-
-            # Get paragraph cursor
-            paragraph = paragraphs[paragraph_index]
-            paragraph_cursor = text.createTextCursorByRange(paragraph)
+            if entries is None:
+                entries, _ = build_paragraph_index(text)
+                indices = resolve_paragraph_indices(paragraph_index, len(entries))
+            paragraphs = collect_paragraphs(text, indices)
 
-            # Delete paragraph
-            text.removeTextContent(paragraph)
+            # Delete from the end so earlier paragraphs are unaffected
+            for index in reversed(indices):
+                text.removeTextContent(paragraphs[index])
 
             # Save document
-            doc.store()
-            return f"Paragraph at index {paragraph_index} deleted from {file_path}"
+            store_document(doc)
+            set_cached(
+                file_path,
+                "paragraph_index",
+                remove_paragraph_index_entries(entries, indices),
+            )
+
+            if len(indices) == 1:
+                return f"Paragraph at index {indices[0]} deleted from {file_path}"
+            return f"Deleted {len(indices)} paragraphs ({', '.join(str(i) for i in indices)}) from {file_path}"
         else:
             raise HelperError("Document does not support paragraph deletion")
 
 
-def apply_document_style(file_path, style):
-    """Apply consistent formatting throughout the document."""
+ALIGNMENT_MAP = {
+    "left": LEFT,
+    "center": CENTER,
+    "right": RIGHT,
+    "justify": BLOCK,
+}
+
+# Paragraph styles restyled in "styles" mode. Standard is always changed; the
+# others only where they override a property themselves, so the rest keep
+# inheriting the new value.
+BODY_STYLES = ["Standard", "Text body"]
+HEADING_STYLES = ["Heading"] + [f"Heading {level}" for level in range(1, 11)]
+
+
+def read_document_style(style):
+    """Translate a style spec into character/paragraph property values."""
+    properties = {}
+    if "font_name" in style:
+        properties["CharFontName"] = style["font_name"]
+    if "font_size" in style:
+        properties["CharHeight"] = float(style["font_size"])
+    if "color" in style:
+        color = style["color"]
+        if isinstance(color, str) and color.startswith("#"):
+            color = int(color[1:], 16)
+        properties["CharColor"] = color
+    if "alignment" in style and style["alignment"].lower() in ALIGNMENT_MAP:
+        properties["ParaAdjust"] = ALIGNMENT_MAP[style["alignment"].lower()]
+    return properties
+
+
+def apply_paragraph_styles(doc, properties):
+    """Set properties on the document's paragraph styles, returning the styles changed."""
+    paragraph_styles = doc.getStyleFamilies().getByName("ParagraphStyles")
+    # Headings keep their own sizes and alignment
+    heading_properties = {
+        name: value
+        for name, value in properties.items()
+        if name in ("CharFontName", "CharColor")
+    }
+    changed = []
+    for style_name in BODY_STYLES + HEADING_STYLES:
+        if not paragraph_styles.hasByName(style_name):
+            continue
+        wanted = properties if style_name in BODY_STYLES else heading_properties
+        para_style = paragraph_styles.getByName(style_name)
+        for name, value in wanted.items():
+            if (
+                style_name == "Standard"
+                or para_style.getPropertyState(name) == DIRECT_VALUE
+            ):
+                para_style.setPropertyValue(name, value)
+                if style_name not in changed:
+                    changed.append(style_name)
+    return changed
+
+
+def apply_document_style(file_path, style, mode="direct"):
+    """
+    Apply consistent formatting throughout the document.
+
+    In "direct" mode the whole body text gets direct formatting. In "styles"
+    mode the Default, Text Body and Heading paragraph styles are changed
+    instead, which costs one property set per style rather than a re-layout
+    of every text portion. Text that carries direct formatting keeps it.
+    """
+    if mode not in ("direct", "styles"):
+        raise HelperError(f"Unknown style mode '{mode}'. Choose from: direct, styles")
+
     with managed_document(file_path) as doc:
         if not hasattr(doc, "getText"):
             raise HelperError("Document does not support style application")
 
+        properties = read_document_style(style)
+
+        if mode == "styles":
+            changed = apply_paragraph_styles(doc, properties)
+            store_document(doc)
+            return (
+                f"Style applied to paragraph styles {', '.join(changed)} in {file_path}"
+            )
+
         # Apply styles to all paragraphs
         text = doc.getText()
         cursor = text.createTextCursor()
         cursor.gotoStart(False)
         cursor.gotoEnd(True)
 
-        # Apply character formatting
-        if "font_name" in style:
-            cursor.CharFontName = style["font_name"]
-
-        if "font_size" in style:
-            cursor.CharHeight = float(style["font_size"])
-
-        if "color" in style:
-            color = style["color"]
-            if isinstance(color, str) and color.startswith("#"):
-                color = int(color[1:], 16)
-            cursor.CharColor = color
-
-        # Apply paragraph formatting
-        if "alignment" in style:
-            alignment_map = {
-                "left": LEFT,
-                "center": CENTER,
-                "right": RIGHT,
-                "justify": BLOCK,
-            }
-            if style["alignment"].lower() in alignment_map:
-                cursor.ParaAdjust = alignment_map[style["alignment"].lower()]
+        # Apply character and paragraph formatting
+        for name, value in properties.items():
+            setattr(cursor, name, value)
 
         # Save document
-        doc.store()
+        store_document(doc)
         return f"Style applied to document {file_path}"
 
 
@@ -900,57 +1829,391 @@ def get_validated_slide(draw_pages, slide_index, delete=False):
     return target_slide
 
 
-def find_template_files(base_directory, template_name):
-    """Recursively search for presentation template files in a directory."""
-    found_templates = []
+TITLE_SHAPE = "com.sun.star.presentation.TitleTextShape"
+SUBTITLE_SHAPE = "com.sun.star.presentation.SubtitleShape"
+OUTLINER_SHAPE = "com.sun.star.presentation.OutlinerShape"
+TEXT_SHAPE = "com.sun.star.drawing.TextShape"
 
-    if not os.path.exists(base_directory) or not os.path.isdir(base_directory):
-        logging.info(f"Directory does not exist: {base_directory}")
-        return found_templates
+# PresentationObject values of title and content placeholders
+TITLE_PRESENTATION_OBJECTS = (0, 1)
+CONTENT_PRESENTATION_OBJECTS = (2, 3, 4, 5)
 
-    template_extensions = [".otp"]  # Only support .otp initially
 
+def read_shape_attributes(shape):
+    """Read a shape's name and position with a single batched property call."""
     try:
-        # Walk through all subdirectories recursively
-        for root, dirs, files in os.walk(base_directory):
-            logging.info(f"Searching in directory: {root}")
-
-            for file in files:
-                file_lower = file.lower()
-                template_name_lower = template_name.lower()
-
-                # Check if file matches template name and has a valid extension
-                for ext in template_extensions:
-                    # Check for exact match with extension
-                    if file_lower == f"{template_name_lower}{ext}":
-                        full_path = os.path.join(root, file)
-                        found_templates.append(full_path)
-                        logging.info(f"Found exact match: {full_path}")
-                    # Check for partial match (template name contained in filename)
-                    elif template_name_lower in file_lower and file_lower.endswith(ext):
-                        full_path = os.path.join(root, file)
-                        found_templates.append(full_path)
-                        logging.info(f"Found partial match: {full_path}")
-
-        # Sort by preference: exact matches first, then by file extension preference
-        def sort_key(template_path):
-            filename = os.path.basename(template_path).lower()
-            template_name_lower = template_name.lower()
-
-            # Exact match gets highest priority
-            if filename.startswith(f"{template_name_lower}."):
-                return (0, template_path)
-            # Partial matches get lower priority
-            else:
-                return (1, template_path)
+        name, position = shape.getPropertyValues(("Name", "Position"))
+    except Exception:
+        name, position = shape.Name, shape.Position
+    return (name or "").lower(), position.Y
+
+
+def title_role(shape_type, name, y_pos, get_text, presentation_object=None):
+    """Return (priority, reason) if a shape looks like a slide title, else None."""
+    if shape_type == TITLE_SHAPE:
+        return 1, "TitleTextShape"
+    if shape_type == OUTLINER_SHAPE:
+        return None
+    if shape_type == SUBTITLE_SHAPE:
+        return 2, "SubtitleShape"
+    if presentation_object in TITLE_PRESENTATION_OBJECTS:
+        return 2, f"PresentationObject-{presentation_object}"
+    if shape_type == TEXT_SHAPE and y_pos < 3000:
+        return 3, f"TextShape-top-Y{y_pos}"
+    if any(keyword in name for keyword in ["content", "body", "outline"]):
+        return None
+    if any(keyword in name for keyword in ["title", "heading", "header"]):
+        return 4, f"name-{name}"
+    if y_pos < 3000:
+        # Short existing text in the top area is most likely a title
+        existing_text = get_text().strip()
+        if existing_text and len(existing_text) < 100:
+            return 4, f"position-with-title-text-Y{y_pos}"
+        return 5, f"position-top-Y{y_pos}"
+    if y_pos < 10000:
+        return 6, "fallback-text-capable-top-half"
+    return None
+
+
+def content_role(shape_type, name, y_pos, get_text, presentation_object=None):
+    """Return (priority, reason) if a shape looks like the slide's main content, else None."""
+    if shape_type == OUTLINER_SHAPE:
+        return 1, "OutlinerShape"
+    if shape_type in (TITLE_SHAPE, SUBTITLE_SHAPE):
+        return None
+    if presentation_object in CONTENT_PRESENTATION_OBJECTS:
+        return 2, f"PresentationObject-{presentation_object}"
+    if shape_type == TEXT_SHAPE:
+        return 3, "TextShape"
+    if "title" in name:
+        return None
+    if any(keyword in name for keyword in ["content", "text", "outline", "body"]):
+        return 4, f"name-{name}"
+    if y_pos > 3000:
+        # Shapes below the title area that already hold text are preferred
+        if get_text().strip():
+            return 4, f"position-with-content-Y{y_pos}"
+        return 5, f"position-Y{y_pos}"
+    return 6, "fallback-text-capable"
+
+
+def classify_slide_shapes(slide):
+    """
+    Classify the shapes on a slide in a single pass.
 
-        found_templates.sort(key=sort_key)
+    Returns title and content candidates as (priority, shape index, reason)
+    tuples, best first, plus the indices of all other shapes. Shape text is
+    only read for shapes that can't be classified from type, name or position.
+    """
+    roles = {"title": [], "content": [], "other": []}
+
+    for i in range(slide.getCount()):
+        try:
+            shape = slide.getByIndex(i)
+            shape_type = shape.getShapeType()
+            if not hasattr(shape, "getText"):
+                roles["other"].append(i)
+                continue
+
+            name, y_pos = read_shape_attributes(shape)
+            text_cache = []
+
+            def get_text():
+                if not text_cache:
+                    text_cache.append(shape.getText().getString())
+                return text_cache[0]
+
+            # Only some shapes carry a placeholder type
+            try:
+                presentation_object = getattr(shape, "PresentationObject", None)
+            except Exception:
+                presentation_object = None
+
+            title = title_role(shape_type, name, y_pos, get_text, presentation_object)
+            content = content_role(
+                shape_type, name, y_pos, get_text, presentation_object
+            )
+            if title:
+                roles["title"].append((title[0], i, title[1]))
+            if content:
+                roles["content"].append((content[0], i, content[1]))
+            if not title and not content:
+                roles["other"].append(i)
+        except Exception as shape_error:
+            logging.warning(f"  Error examining shape {i}: {shape_error}")
+
+    roles["title"].sort()
+    roles["content"].sort()
+    return roles
+
+
+def get_slide_roles(roles_map, slide, slide_index):
+    """Return the shape roles for a slide, classifying it on first use."""
+    roles = roles_map.get(slide_index)
+    if roles is None:
+        roles = classify_slide_shapes(slide)
+        roles_map[slide_index] = roles
+    return roles
+
+
+def load_slide_roles(file_path):
+    """Return the cached slide_index -> roles map for a presentation."""
+    return get_cached(file_path, "slide_roles") or {}
+
+
+def pick_slide_shape(slide, candidates, max_priority=None, exclude=()):
+    """Return (shape, candidate) for the best candidate, or (None, None)."""
+    for candidate in candidates:
+        priority, index, reason = candidate
+        if max_priority is not None and priority > max_priority:
+            break
+        if index in exclude:
+            continue
+        logging.info(
+            f"Selected shape at index {index} with priority {priority} (reason: {reason})"
+        )
+        return slide.getByIndex(index), candidate
+    return None, None
+
+
+TEMPLATE_EXTENSIONS = [".otp"]  # Only support .otp initially
+
+# Catalog of presentation templates, persisted between helper runs
+TEMPLATE_CATALOG_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "template_catalog.json"
+)
+_template_catalog = None
+
+
+def get_settings_path():
+    """Locate the application settings file shared with the UI."""
+    settings_path = os.environ.get("LIBREOFFICEAI_SETTINGS")
+    if settings_path:
+        return settings_path
+    return os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), os.pardir, "settings.json"
+    )
 
-    except Exception as e:
-        logging.error(f"Error searching for templates in {base_directory}: {e}")
-        logging.error(traceback.format_exc())
 
-    return found_templates
+def get_template_search_dirs():
+    """Return the template search roots: LibreOffice's template paths plus configured folders."""
+    search_dirs = []
+
+    # Template folders of the running LibreOffice (Tools > Options > Paths),
+    # covering both the installation and the user profile
+    try:
+        ctx = get_office_context()
+        path_settings = ctx.ServiceManager.createInstanceWithContext(
+            "com.sun.star.util.PathSettings", ctx
+        )
+        search_dirs.extend(
+            uno.fileUrlToSystemPath(url)
+            for url in path_settings.Template.split(";")
+            if url.startswith("file:")
+        )
+    except Exception as path_error:
+        logging.info(f"Could not read LibreOffice template paths: {path_error}")
+
+    if not search_dirs:
+        # Without LibreOffice, fall back to the default user template folder
+        home_dir = os.path.expanduser("~")
+        if sys.platform == "win32":
+            app_data = os.environ.get("APPDATA", f"{home_dir}/AppData/Roaming")
+            search_dirs.append(
+                os.path.join(app_data, "LibreOffice", "4", "user", "template")
+            )
+        elif sys.platform == "darwin":
+            search_dirs.append(
+                f"{home_dir}/Library/Application Support/LibreOffice/4/user/template"
+            )
+        else:
+            search_dirs.append(f"{home_dir}/.config/libreoffice/4/user/template")
+
+    # Additional folders added in the application settings
+    try:
+        with open(get_settings_path(), encoding="utf-8-sig") as settings_file:
+            settings = json.load(settings_file)
+        search_dirs.extend(settings.get("addedPresentationTemplatesPaths", []) or [])
+    except (OSError, ValueError) as settings_error:
+        logging.info(f"Could not read template folders from settings: {settings_error}")
+
+    unique_dirs = []
+    for search_dir in search_dirs:
+        search_dir = os.path.normpath(search_dir)
+        if search_dir not in unique_dirs:
+            unique_dirs.append(search_dir)
+    return unique_dirs
+
+
+def save_template_catalog(catalog):
+    """Persist the template catalog so it survives helper restarts."""
+    try:
+        with open(TEMPLATE_CATALOG_PATH, "w", encoding="utf-8") as catalog_file:
+            json.dump(
+                {key: catalog[key] for key in ("roots", "directories", "templates")},
+                catalog_file,
+                indent=2,
+            )
+    except OSError as save_error:
+        logging.warning(f"Could not save template catalog: {save_error}")
+
+
+def index_template_names(catalog):
+    """Build the lower-case name -> paths lookup for a catalog."""
+    by_name = {}
+    for entry in catalog["templates"].values():
+        by_name.setdefault(entry["name"].lower(), []).append(entry["path"])
+    catalog["by_name"] = by_name
+    return catalog
+
+
+def template_catalog_is_stale(catalog, roots):
+    """Check whether any search root, scanned directory or template has changed."""
+    if catalog["roots"] != roots:
+        return True
+    for root in roots:
+        if os.path.isdir(root) != (root in catalog["directories"]):
+            return True
+    for directory, mtime in catalog["directories"].items():
+        try:
+            if os.stat(directory).st_mtime_ns != mtime:
+                return True
+        except OSError:
+            return True
+    # Editing a template in place does not touch its directory
+    for template_path, entry in catalog["templates"].items():
+        try:
+            if os.stat(template_path).st_mtime_ns != entry["mtime"]:
+                return True
+        except OSError:
+            return True
+    return False
+
+
+def build_template_catalog(roots, previous=None):
+    """Walk the search roots once, recording templates and directory mtimes."""
+    previous_templates = previous["templates"] if previous else {}
+    directories = {}
+    templates = {}
+
+    for root_dir in roots:
+        if not os.path.isdir(root_dir):
+            logging.info(f"Directory does not exist: {root_dir}")
+            continue
+        try:
+            for root, dirs, files in os.walk(root_dir):
+                directories[root] = os.stat(root).st_mtime_ns
+                for file in files:
+                    name, ext = os.path.splitext(file)
+                    if ext.lower() not in TEMPLATE_EXTENSIONS:
+                        continue
+                    full_path = os.path.join(root, file)
+                    mtime = os.stat(full_path).st_mtime_ns
+                    entry = {
+                        "path": full_path,
+                        "name": name,
+                        "mtime": mtime,
+                        "valid": None,
+                    }
+                    # Keep the validation status of templates that have not changed
+                    known = previous_templates.get(full_path)
+                    if known and known["mtime"] == mtime:
+                        entry["valid"] = known["valid"]
+                    templates[full_path] = entry
+        except Exception as e:
+            logging.error(f"Error searching for templates in {root_dir}: {e}")
+            logging.error(traceback.format_exc())
+
+    logging.info(
+        f"Template catalog built: {len(templates)} templates in {len(directories)} directories"
+    )
+    return index_template_names(
+        {"roots": roots, "directories": directories, "templates": templates}
+    )
+
+
+def get_template_catalog(refresh=False):
+    """Return the template catalog, rebuilding it only when its files have changed."""
+    global _template_catalog
+
+    roots = get_template_search_dirs()
+
+    if _template_catalog is None:
+        try:
+            with open(TEMPLATE_CATALOG_PATH, encoding="utf-8") as catalog_file:
+                _template_catalog = index_template_names(json.load(catalog_file))
+        except (OSError, ValueError, KeyError):
+            _template_catalog = None
+
+    if (
+        refresh
+        or _template_catalog is None
+        or template_catalog_is_stale(_template_catalog, roots)
+    ):
+        # A forced refresh also forgets which templates failed to load
+        _template_catalog = build_template_catalog(
+            roots, None if refresh else _template_catalog
+        )
+        save_template_catalog(_template_catalog)
+
+    return _template_catalog
+
+
+def set_template_validity(template_path, valid):
+    """Record whether a catalogued template could be loaded."""
+    catalog = get_template_catalog()
+    entry = catalog["templates"].get(template_path)
+    if entry and entry["valid"] != valid:
+        entry["valid"] = valid
+        save_template_catalog(catalog)
+
+
+def find_template_files(template_name):
+    """Look up presentation templates by name, exact matches first."""
+    catalog = get_template_catalog()
+    template_name_lower = template_name.lower()
+
+    # Exact name lookups come straight from the name index
+    found_templates = sorted(catalog["by_name"].get(template_name_lower, []))
+
+    # Partial matches (template name contained in filename) only if needed
+    if not found_templates:
+        found_templates = sorted(
+            path
+            for name, paths in catalog["by_name"].items()
+            if template_name_lower in name
+            for path in paths
+        )
+
+    # Templates that failed to load before are still tried, but last
+    return sorted(
+        found_templates,
+        key=lambda path: catalog["templates"][path]["valid"] is False,
+    )
+
+
+def list_templates(refresh=False):
+    """List all catalogued presentation templates."""
+    catalog = get_template_catalog(refresh)
+    templates = sorted(
+        catalog["templates"].values(), key=lambda entry: entry["name"].lower()
+    )
+    result = {
+        "search_directories": catalog["roots"],
+        "template_count": len(templates),
+        "templates": [
+            {
+                "name": entry["name"],
+                "path": entry["path"],
+                "modified": time.strftime(
+                    "%Y-%m-%d %H:%M:%S", time.localtime(entry["mtime"] / 1e9)
+                ),
+                "valid": entry["valid"],
+            }
+            for entry in templates
+        ],
+    }
+    return json.dumps(result, indent=2)
 
 
 def add_main_textbox(doc, target_slide):
@@ -1039,38 +2302,166 @@ def add_main_textbox(doc, target_slide):
 # Impress functions
 
 
-def extract_impress_text(file_path):
-    """Extract all text from an Impress presentation (.odp)."""
+def get_slide_text(slide):
+    """Collect the text of every text-bearing shape on a slide."""
+    slide_texts = []
+    # Iterate over all shapes on the slide
+    for shape_idx in range(slide.getCount()):
+        shape = slide.getByIndex(shape_idx)
+        # Some shapes have getString(), some have getText()
+        if hasattr(shape, "getString"):
+            text = shape.getString()
+            if text:
+                slide_texts.append(text)
+        elif hasattr(shape, "getText"):
+            text_obj = shape.getText()
+            if hasattr(text_obj, "getString"):
+                text = text_obj.getString()
+                if text:
+                    slide_texts.append(text)
+    return "\n".join(slide_texts)
+
+
+def extract_impress_text(file_path, start_slide=None, max_slides=None):
+    """
+    Extract all text from an Impress presentation (.odp).
+
+    When start_slide or max_slides is given, a JSON object is returned holding
+    only that range of slides, with next_cursor set to the start_slide of the
+    following chunk (or null after the last slide).
+    """
     with managed_document(file_path, read_only=True) as doc:
         if valid_presentation(doc):
             draw_pages = doc.getDrawPages()
             slide_count = draw_pages.getCount()
-            all_text = []
 
+            if start_slide is not None or max_slides is not None:
+                start_slide = start_slide or 0
+                if start_slide < 0:
+                    raise HelperError(f"Slide index {start_slide} is out of range")
+                if max_slides is not None and max_slides <= 0:
+                    raise HelperError("max_slides must be a positive number")
+
+                # Like the Writer range reads, a start past the end gives an
+                # empty range rather than an error
+                end_slide = slide_count
+                if max_slides is not None:
+                    end_slide = min(end_slide, start_slide + max_slides)
+                end_slide = max(start_slide, end_slide)
+                slides = [
+                    {"index": i, "text": get_slide_text(draw_pages.getByIndex(i))}
+                    for i in range(start_slide, end_slide)
+                ]
+                result = {
+                    "start_slide": start_slide,
+                    "end_slide": end_slide,
+                    "total_slides": slide_count,
+                    "slides": slides,
+                    "next_cursor": end_slide if end_slide < slide_count else None,
+                }
+                return json.dumps(result, indent=2)
+
+            all_text = []
             for i in range(slide_count):
                 slide = draw_pages.getByIndex(i)
-                slide_texts = []
-                # Iterate over all shapes on the slide
-                for shape_idx in range(slide.getCount()):
-                    shape = slide.getByIndex(shape_idx)
-                    # Some shapes have getString(), some have getText()
-                    if hasattr(shape, "getString"):
-                        text = shape.getString()
-                        if text:
-                            slide_texts.append(text)
-                    elif hasattr(shape, "getText"):
-                        text_obj = shape.getText()
-                        if hasattr(text_obj, "getString"):
-                            text = text_obj.getString()
-                            if text:
-                                slide_texts.append(text)
-                all_text.append(f"Slide {i + 1}:\n" + "\n".join(slide_texts))
+                all_text.append(f"Slide {i + 1}:\n" + get_slide_text(slide))
 
             return (
                 "\n\n".join(all_text) if all_text else "No text found in presentation."
             )
 
 
+def apply_slide_layout(slide, layout_type):
+    """Apply an AutoLayout to a slide, returning True if it was applied."""
+    layout_applied = False
+    try:
+        logging.info(f"Applying layout type: {layout_type}")
+
+        # Apply the layout using different methods
+        if hasattr(slide, "setLayout"):
+            slide.setLayout(layout_type)
+            layout_applied = True
+            logging.info("Layout applied using setLayout")
+        elif hasattr(slide, "Layout"):
+            slide.Layout = layout_type
+            layout_applied = True
+            logging.info("Layout applied using Layout property")
+        else:
+            logging.warning("No layout method found")
+
+    except Exception as layout_error:
+        logging.warning(f"Could not apply layout: {layout_error}")
+
+    return layout_applied
+
+
+def fill_slide_text(doc, new_slide, title=None, content=None):
+    """Put title and content text into a new slide's placeholders, creating shapes if needed."""
+    # Now look for the actual placeholder shapes that were created by the layout
+    logging.info(f"Number of shapes on slide: {new_slide.getCount()}")
+    roles = classify_slide_shapes(new_slide)
+    title_shape, title_match = pick_slide_shape(new_slide, roles["title"])
+    content_shape, _ = pick_slide_shape(
+        new_slide,
+        roles["content"],
+        exclude=(title_match[1],) if title_match else (),
+    )
+
+    # If we still don't have placeholders and text was requested, create manual shapes
+    if title and not title_shape:
+        logging.info("Creating manual title shape")
+        title_shape = doc.createInstance("com.sun.star.drawing.TextShape")
+        title_shape.setSize(Size(24000, 3000))
+        title_shape.setPosition(uno.createUnoStruct("com.sun.star.awt.Point"))
+        title_shape.Position.X = 2000
+        title_shape.Position.Y = 2000
+        new_slide.add(title_shape)
+
+    if content and not content_shape:
+        logging.info("Creating manual content shape")
+        content_shape = doc.createInstance("com.sun.star.drawing.TextShape")
+        content_shape.setSize(Size(24000, 14000))
+        content_shape.setPosition(uno.createUnoStruct("com.sun.star.awt.Point"))
+        content_shape.Position.X = 2000
+        content_shape.Position.Y = 6000
+        new_slide.add(content_shape)
+
+    # Set title text
+    if title and title_shape:
+        logging.info(f"Setting title text: {title}")
+        try:
+            title_text = title_shape.getText()
+            title_text.setString(title)
+
+            # Format title
+            title_cursor = title_text.createTextCursor()
+            title_cursor.gotoStart(False)
+            title_cursor.gotoEnd(True)
+            title_cursor.CharHeight = 28
+            title_cursor.CharWeight = 150
+            title_cursor.ParaAdjust = CENTER
+            logging.info("Title text set and formatted")
+        except Exception as title_error:
+            logging.error(f"Error setting title: {title_error}")
+
+    # Set content text
+    if content and content_shape:
+        logging.info(f"Setting content text: {content}")
+        try:
+            content_text = content_shape.getText()
+            content_text.setString(content)
+
+            # Format content
+            content_cursor = content_text.createTextCursor()
+            content_cursor.gotoStart(False)
+            content_cursor.gotoEnd(True)
+            content_cursor.CharHeight = 18
+            content_cursor.ParaAdjust = LEFT
+            logging.info("Content text set and formatted")
+        except Exception as content_error:
+            logging.error(f"Error setting content: {content_error}")
+
+
 def add_slide(file_path, slide_index=None, title=None, content=None):
     """
     Add a new slide to an Impress presentation using a built-in layout.
@@ -1104,183 +2495,123 @@ def add_slide(file_path, slide_index=None, title=None, content=None):
             logging.info("New slide created")
 
             # Apply slide layout first
-            layout_applied = False
-            try:
-                layout_type = 1  # TitleContent layout
-                logging.info(f"Applying layout type: {layout_type}")
-
-                # Apply the layout using different methods
-                if hasattr(new_slide, "setLayout"):
-                    new_slide.setLayout(layout_type)
-                    layout_applied = True
-                    logging.info("Layout applied using setLayout")
-                elif hasattr(new_slide, "Layout"):
-                    new_slide.Layout = layout_type
-                    layout_applied = True
-                    logging.info("Layout applied using Layout property")
-                else:
-                    logging.warning("No layout method found")
-
-            except Exception as layout_error:
-                logging.warning(f"Could not apply layout: {layout_error}")
+            layout_applied = apply_slide_layout(new_slide, 1)  # TitleContent layout
 
             # Give LibreOffice time to create the placeholder shapes
             if layout_applied:
                 time.sleep(0.5)
 
-            # Now look for the actual placeholder shapes that were created by the layout
-            title_shape = None
-            content_shape = None
+            fill_slide_text(doc, new_slide, title, content)
 
-            logging.info(f"Number of shapes on slide: {new_slide.getCount()}")
+            # Save and close
+            logging.info("Saving document...")
+            store_document(doc)
 
-            # Examine all shapes on the slide
-            for i in range(new_slide.getCount()):
-                shape = new_slide.getByIndex(i)
-                shape_type = shape.getShapeType()
-                logging.info(f"Shape {i}: {shape_type}")
+            success_msg = f"Slide added at index {insert_index} with TitleContent layout in {file_path}"
+            logging.info(success_msg)
+            return success_msg
 
-                # Check if this shape has text capabilities
-                if hasattr(shape, "getText"):
-                    try:
-                        # Check for LibreOffice presentation shapes by type
-                        if shape_type == "com.sun.star.presentation.TitleTextShape":
-                            title_shape = shape
-                            logging.info(f"  Found title shape at index {i}")
-                        elif shape_type == "com.sun.star.presentation.OutlinerShape":
-                            # This is a content placeholder - use the first one we find
-                            if not content_shape:
-                                content_shape = shape
-                                logging.info(f"  Found content shape at index {i}")
-                            else:
-                                logging.info(
-                                    f"  Found additional content shape at index {i} (ignoring)"
-                                )
 
-                        # Fallback: Try to get presentation object type
-                        elif hasattr(shape, "PresentationObject"):
-                            pres_obj = shape.PresentationObject
-                            logging.info(f"  PresentationObject: {pres_obj}")
+# AutoLayout values that slide specs can refer to by name
+SLIDE_LAYOUTS = {
+    "title": 0,  # Title slide
+    "title_content": 1,
+    "title_only": 19,
+    "blank": 20,
+}
 
-                            # Check for title placeholder
-                            if (
-                                pres_obj in [0, 1] and not title_shape
-                            ):  # Title placeholders
-                                title_shape = shape
-                                logging.info(f"  Found title placeholder at shape {i}")
-                            # Check for content placeholder
-                            elif (
-                                pres_obj in [2, 3, 4, 5] and not content_shape
-                            ):  # Content placeholders
-                                content_shape = shape
-                                logging.info(
-                                    f"  Found content placeholder at shape {i}"
-                                )
 
-                        # Additional fallback: check shape name or position
-                        else:
-                            if hasattr(shape, "Name"):
-                                shape_name = shape.Name.lower()
-                                logging.info(f"  Shape name: '{shape_name}'")
-                                if "title" in shape_name and not title_shape:
-                                    title_shape = shape
-                                    logging.info(
-                                        f"  Found title shape by name at shape {i}"
-                                    )
-                                elif (
-                                    any(
-                                        keyword in shape_name
-                                        for keyword in ["content", "text", "outline"]
-                                    )
-                                    and not content_shape
-                                ):
-                                    content_shape = shape
-                                    logging.info(
-                                        f"  Found content shape by name at shape {i}"
-                                    )
+def set_slide_notes(slide, notes):
+    """Set the speaker notes of a slide, returning False if it has no notes placeholder."""
+    notes_page = slide.getNotesPage()
+    for i in range(notes_page.getCount()):
+        shape = notes_page.getByIndex(i)
+        if shape.getShapeType() == "com.sun.star.presentation.NotesShape":
+            shape.getText().setString(notes)
+            return True
+    return False
 
-                            # Position-based fallback (title usually at top)
-                            if (
-                                hasattr(shape, "Position")
-                                and not title_shape
-                                and not content_shape
-                            ):
-                                y_pos = shape.Position.Y
-                                if y_pos < 5000:  # Top area - likely title
-                                    title_shape = shape
-                                    logging.info(
-                                        f"  Assuming title shape by position at shape {i} (Y: {y_pos})"
-                                    )
-                                elif (
-                                    y_pos > 5000 and not content_shape
-                                ):  # Lower area - likely content
-                                    content_shape = shape
-                                    logging.info(
-                                        f"  Assuming content shape by position at shape {i} (Y: {y_pos})"
-                                    )
 
-                    except Exception as shape_error:
-                        logging.warning(f"  Error examining shape {i}: {shape_error}")
-
-            # If we still don't have placeholders and text was requested, create manual shapes
-            if title and not title_shape:
-                logging.info("Creating manual title shape")
-                title_shape = doc.createInstance("com.sun.star.drawing.TextShape")
-                title_shape.setSize(Size(24000, 3000))
-                title_shape.setPosition(uno.createUnoStruct("com.sun.star.awt.Point"))
-                title_shape.Position.X = 2000
-                title_shape.Position.Y = 2000
-                new_slide.add(title_shape)
-
-            if content and not content_shape:
-                logging.info("Creating manual content shape")
-                content_shape = doc.createInstance("com.sun.star.drawing.TextShape")
-                content_shape.setSize(Size(24000, 14000))
-                content_shape.setPosition(uno.createUnoStruct("com.sun.star.awt.Point"))
-                content_shape.Position.X = 2000
-                content_shape.Position.Y = 6000
-                new_slide.add(content_shape)
-
-            # Set title text
-            if title and title_shape:
-                logging.info(f"Setting title text: {title}")
-                try:
-                    title_text = title_shape.getText()
-                    title_text.setString(title)
-
-                    # Format title
-                    title_cursor = title_text.createTextCursor()
-                    title_cursor.gotoStart(False)
-                    title_cursor.gotoEnd(True)
-                    title_cursor.CharHeight = 28
-                    title_cursor.CharWeight = 150
-                    title_cursor.ParaAdjust = CENTER
-                    logging.info("Title text set and formatted")
-                except Exception as title_error:
-                    logging.error(f"Error setting title: {title_error}")
-
-            # Set content text
-            if content and content_shape:
-                logging.info(f"Setting content text: {content}")
-                try:
-                    content_text = content_shape.getText()
-                    content_text.setString(content)
-
-                    # Format content
-                    content_cursor = content_text.createTextCursor()
-                    content_cursor.gotoStart(False)
-                    content_cursor.gotoEnd(True)
-                    content_cursor.CharHeight = 18
-                    content_cursor.ParaAdjust = LEFT
-                    logging.info("Content text set and formatted")
-                except Exception as content_error:
-                    logging.error(f"Error setting content: {content_error}")
+def build_presentation(file_path, slides, replace_existing=False):
+    """
+    Append a whole sequence of slides to a presentation in one open/store cycle.
+
+    Args:
+        file_path: Path to the presentation file.
+        slides: Ordered list of slide specs. Each spec is a dict with optional keys:
+            - title: Title text
+            - content: Body text, or a list of bullet strings
+            - image: Image path, or a dict of insert_slide_image arguments
+              including image_path
+            - notes: Speaker notes text
+            - layout: Layout name (title, title_content, title_only, blank)
+              or AutoLayout number (defaults to title_content)
+        replace_existing: Remove the presentation's existing slides afterwards.
+    """
+    logging.info(
+        f"build_presentation called with: file_path={file_path}, slides={len(slides or [])}"
+    )
+
+    if not slides:
+        raise HelperError("No slides provided")
+
+    # Validate every spec before touching the document
+    for spec_index, spec in enumerate(slides):
+        if not isinstance(spec, dict):
+            raise HelperError(f"Slide spec {spec_index} must be an object")
+        layout = spec.get("layout", "title_content")
+        if isinstance(layout, str) and layout not in SLIDE_LAYOUTS:
+            raise HelperError(
+                f"Unknown layout '{layout}' in slide spec {spec_index}. Choose from: {list(SLIDE_LAYOUTS.keys())}"
+            )
+        image = spec.get("image")
+        if image:
+            image_path = image.get("image_path") if isinstance(image, dict) else image
+            if not image_path or not os.path.exists(normalize_path(image_path)):
+                raise HelperError(
+                    f"Image not found in slide spec {spec_index}: {image_path}"
+                )
+
+    with managed_document(file_path) as doc:
+        if valid_presentation(doc):
+            draw_pages = doc.getDrawPages()
+            existing_slides = [
+                draw_pages.getByIndex(i) for i in range(draw_pages.getCount())
+            ]
+
+            for spec_index, spec in enumerate(slides):
+                # insertNewByIndex inserts after the given index and returns the new page
+                new_slide = draw_pages.insertNewByIndex(draw_pages.getCount() - 1)
+
+                layout = spec.get("layout", "title_content")
+                apply_slide_layout(
+                    new_slide,
+                    SLIDE_LAYOUTS[layout] if isinstance(layout, str) else int(layout),
+                )
+
+                content = spec.get("content")
+                if isinstance(content, (list, tuple)):
+                    content = "\n".join(str(item) for item in content)
+                fill_slide_text(doc, new_slide, spec.get("title"), content)
+
+                image = spec.get("image")
+                if image:
+                    image_args = dict(image) if isinstance(image, dict) else {}
+                    image_path = normalize_path(image_args.pop("image_path", image))
+                    place_slide_image(doc, new_slide, image_path, **image_args)
+
+                if spec.get("notes") and not set_slide_notes(new_slide, spec["notes"]):
+                    logging.warning(f"Slide spec {spec_index} has no notes placeholder")
+
+            if replace_existing:
+                for old_slide in existing_slides:
+                    draw_pages.remove(old_slide)
 
             # Save and close
             logging.info("Saving document...")
-            doc.store()
+            store_document(doc)
 
-            success_msg = f"Slide added at index {insert_index} with TitleContent layout in {file_path}"
+            success_msg = f"Added {len(slides)} slides to {file_path}. Presentation now has {draw_pages.getCount()} slides."
             logging.info(success_msg)
             return success_msg
 
@@ -1301,157 +2632,10 @@ def edit_slide_content(file_path, slide_index, new_content):
 
             logging.info(f"Editing slide at index: {slide_index}")
 
-            # Enhanced shape detection logic
-            main_content_shape = None
-            all_text_shapes = []  # Store all potential text shapes for fallback
-
-            logging.info(f"Number of shapes on slide: {target_slide.getCount()}")
-
-            # First pass: Collect all text-capable shapes and categorize them
-            for i in range(target_slide.getCount()):
-                try:
-                    shape = target_slide.getByIndex(i)
-                    shape_type = shape.getShapeType()
-                    logging.info(f"Shape {i}: {shape_type}")
-
-                    # Check if this shape has text capabilities
-                    if hasattr(shape, "getText"):
-                        shape_info = {
-                            "shape": shape,
-                            "index": i,
-                            "type": shape_type,
-                            "priority": 99,  # Default low priority
-                            "reason": "unknown",
-                        }
-
-                        # Priority 1: Standard presentation OutlinerShape (highest priority)
-                        if shape_type == "com.sun.star.presentation.OutlinerShape":
-                            shape_info["priority"] = 1
-                            shape_info["reason"] = "OutlinerShape"
-                            all_text_shapes.append(shape_info)
-                            logging.info(
-                                f"  Found OutlinerShape at index {i} (priority 1)"
-                            )
-                            continue
-
-                        # Skip title shapes explicitly
-                        if shape_type == "com.sun.star.presentation.TitleTextShape":
-                            logging.info(f"  Skipping title shape at index {i}")
-                            continue
-
-                        # Priority 2: Check PresentationObject for content placeholders
-                        try:
-                            if hasattr(shape, "PresentationObject"):
-                                pres_obj = shape.PresentationObject
-                                logging.info(f"  PresentationObject: {pres_obj}")
-
-                                # Content placeholders (exclude title placeholders 0,1)
-                                if pres_obj in [2, 3, 4, 5]:
-                                    shape_info["priority"] = 2
-                                    shape_info["reason"] = (
-                                        f"PresentationObject-{pres_obj}"
-                                    )
-                                    all_text_shapes.append(shape_info)
-                                    logging.info(
-                                        f"  Found content placeholder at index {i} (priority 2)"
-                                    )
-                                    continue
-                        except Exception as pres_obj_error:
-                            logging.warning(
-                                f"  Error checking PresentationObject: {pres_obj_error}"
-                            )
-
-                        # Priority 3: Regular TextShape (common for manual text boxes)
-                        if shape_type == "com.sun.star.drawing.TextShape":
-                            shape_info["priority"] = 3
-                            shape_info["reason"] = "TextShape"
-                            all_text_shapes.append(shape_info)
-                            logging.info(f"  Found TextShape at index {i} (priority 3)")
-                            continue
-
-                        # Priority 4: Check shape name for content indicators
-                        if hasattr(shape, "Name"):
-                            shape_name = shape.Name.lower()
-                            logging.info(f"  Shape name: '{shape_name}'")
-
-                            # Skip if name suggests it's a title
-                            if "title" in shape_name:
-                                logging.info(f"  Skipping shape with 'title' in name")
-                                continue
-
-                            # Prefer shapes with content-related names
-                            if any(
-                                keyword in shape_name
-                                for keyword in ["content", "text", "outline", "body"]
-                            ):
-                                shape_info["priority"] = 4
-                                shape_info["reason"] = f"name-{shape_name}"
-                                all_text_shapes.append(shape_info)
-                                logging.info(
-                                    f"  Found content shape by name at index {i} (priority 4)"
-                                )
-                                continue
-
-                        # Priority 5: Position and content-based detection
-                        if hasattr(shape, "Position"):
-                            y_pos = shape.Position.Y
-
-                            # Get existing text content
-                            try:
-                                text_obj = shape.getText()
-                                existing_text = (
-                                    text_obj.getString()
-                                    if hasattr(text_obj, "getString")
-                                    else ""
-                                )
-                            except:
-                                existing_text = ""
-
-                            # Content area detection (below title area)
-                            if y_pos > 3000:  # Likely content area
-                                priority = 5
-                                # Boost priority if shape has existing content
-                                if existing_text.strip():
-                                    priority = 4
-                                    shape_info["reason"] = (
-                                        f"position-with-content-Y{y_pos}"
-                                    )
-                                else:
-                                    shape_info["reason"] = f"position-Y{y_pos}"
-
-                                shape_info["priority"] = priority
-                                all_text_shapes.append(shape_info)
-                                logging.info(
-                                    f"  Found text shape by position at index {i} (priority {priority})"
-                                )
-
-                        # Priority 6: Any other text-capable shape as final fallback
-                        if not any(info["shape"] == shape for info in all_text_shapes):
-                            shape_info["priority"] = 6
-                            shape_info["reason"] = "fallback-text-capable"
-                            all_text_shapes.append(shape_info)
-                            logging.info(
-                                f"  Added fallback text shape at index {i} (priority 6)"
-                            )
-
-                except Exception as shape_error:
-                    logging.warning(f"  Error examining shape {i}: {shape_error}")
-
-            # Sort by priority (lower number = higher priority) and select the best match
-            if all_text_shapes:
-                all_text_shapes.sort(key=lambda x: (x["priority"], x["index"]))
-                best_match = all_text_shapes[0]
-                main_content_shape = best_match["shape"]
-                logging.info(
-                    f"Selected shape at index {best_match['index']} with priority {best_match['priority']} (reason: {best_match['reason']})"
-                )
-
-                # Log all candidates for debugging
-                logging.info("All text shape candidates:")
-                for info in all_text_shapes:
-                    logging.info(
-                        f"  Index {info['index']}: Priority {info['priority']}, Reason: {info['reason']}, Type: {info['type']}"
-                    )
+            # Find the main content shape using the shared shape classifier
+            roles_map = load_slide_roles(file_path)
+            roles = get_slide_roles(roles_map, target_slide, slide_index)
+            main_content_shape, _ = pick_slide_shape(target_slide, roles["content"])
 
             # If still no content shape found, create one
             if not main_content_shape:
@@ -1459,6 +2643,8 @@ def edit_slide_content(file_path, slide_index, new_content):
                     "No suitable text shape found, creating new content textbox"
                 )
                 main_content_shape = add_main_textbox(doc, target_slide)
+                # The slide has a new shape, so its roles must be reclassified
+                roles_map.pop(slide_index, None)
 
             # Edit the selected content shape
             try:
@@ -1504,198 +2690,187 @@ def edit_slide_content(file_path, slide_index, new_content):
 
             # Save and close
             logging.info("Saving document...")
-            doc.store()
+            store_document(doc)
+            # Roles can depend on shape text, so this slide is re-ranked next
+            # time; the other slides keep theirs under the new file signature
+            roles_map.pop(slide_index, None)
+            set_cached(file_path, "slide_roles", roles_map)
 
             success_msg = f"Successfully edited content of slide {slide_index} in {file_path}. {edit_result}"
             logging.info(success_msg)
             return success_msg
 
 
-def edit_slide_title(file_path, slide_index, new_title):
+BULLET_ACTIONS = ["insert", "replace", "delete"]
+
+
+def list_text_paragraphs(text_obj):
+    """Return the paragraph ranges of a shape's text."""
+    paragraphs = []
+    enum = text_obj.createEnumeration()
+    while enum.hasMoreElements():
+        paragraphs.append(enum.nextElement())
+    return paragraphs
+
+
+def apply_bullet_operation(text_obj, paragraphs, paragraph_count, operation):
     """
-    Edit the title of a specific slide in an Impress presentation.
+    Insert, replace or delete one paragraph of a shape's text in place.
+
+    paragraphs is the enumeration taken before any operation was applied and
+    paragraph_count the current number of paragraphs. Operations run from the
+    highest index down, so the ranges up to the operation's index still match
+    their paragraphs.
+    """
+    action = operation["action"]
+    index = operation["index"]
+    new_text = str(operation.get("text", ""))
+    level = operation.get("level")
+
+    if action == "replace":
+        # setString keeps the paragraph's own attributes
+        target = paragraphs[index]
+        target.setString(new_text)
+    elif action == "delete":
+        if paragraph_count == 1:
+            paragraphs[0].setString("")
+            return
+        # Remove the paragraph together with one of its neighbouring breaks
+        if index < paragraph_count - 1:
+            cursor = text_obj.createTextCursorByRange(paragraphs[index].getStart())
+            cursor.gotoRange(paragraphs[index].getEnd(), True)
+            cursor.goRight(1, True)
+        else:
+            cursor = text_obj.createTextCursorByRange(paragraphs[index - 1].getEnd())
+            cursor.gotoRange(paragraphs[index].getEnd(), True)
+        cursor.setString("")
+        return
+    elif index < min(len(paragraphs), paragraph_count):
+        # Splitting in front of the paragraph gives the new one the same attributes
+        target = text_obj.createTextCursorByRange(paragraphs[index].getStart())
+        text_obj.insertString(target, new_text, False)
+        text_obj.insertControlCharacter(target, PARAGRAPH_BREAK, False)
+        # Step back over the break into the new paragraph
+        target.goLeft(1, False)
+    else:
+        # Append after the paragraph in front, which later inserts at the same
+        # index also use, so they stay in order
+        target = text_obj.createTextCursorByRange(paragraphs[index - 1].getEnd())
+        text_obj.insertControlCharacter(target, PARAGRAPH_BREAK, False)
+        text_obj.insertString(target, new_text, False)
+
+    if level is not None:
+        target.NumberingLevel = level
+
+
+def edit_slide_bullets(file_path, slide_index, operations):
+    """
+    Insert, replace or delete individual bullet paragraphs of a slide's content.
+    Args:
+        file_path: Path to the presentation file.
+        slide_index: Index of the slide to edit (0-based).
+        operations: List of dicts with keys:
+            - action: insert, replace or delete
+            - index: Paragraph index in the current content (0-based); insert
+              accepts the paragraph count to append
+            - text: New paragraph text (insert and replace)
+            - level: Optional bullet level (insert and replace)
+    All indices refer to the content before any operation is applied.
     """
     logging.info(
-        f"edit_slide_title called with: file_path={file_path}, slide_index={slide_index}"
+        f"edit_slide_bullets called with: file_path={file_path}, slide_index={slide_index}, operations={len(operations or [])}"
     )
 
+    if not operations:
+        raise HelperError("No bullet operations provided")
+
     with managed_document(file_path) as doc:
         if valid_presentation(doc):
             draw_pages = doc.getDrawPages()
-
             target_slide = get_validated_slide(draw_pages, slide_index)
-            logging.info(f"Editing title of slide at index: {slide_index}")
-
-            # Enhanced shape detection logic specifically for title shapes
-            main_title_shape = None
-            all_title_shapes = []  # Store all potential title shapes for fallback
-
-            logging.info(f"Number of shapes on slide: {target_slide.getCount()}")
-
-            # First pass: Collect all text-capable shapes and categorize them for title detection
-            for i in range(target_slide.getCount()):
-                try:
-                    shape = target_slide.getByIndex(i)
-                    shape_type = shape.getShapeType()
-                    logging.info(f"Shape {i}: {shape_type}")
-
-                    # Check if this shape has text capabilities
-                    if hasattr(shape, "getText"):
-                        shape_info = {
-                            "shape": shape,
-                            "index": i,
-                            "type": shape_type,
-                            "priority": 99,  # Default low priority
-                            "reason": "unknown",
-                        }
-
-                        # Priority 1: Standard presentation TitleTextShape (highest priority)
-                        if shape_type == "com.sun.star.presentation.TitleTextShape":
-                            shape_info["priority"] = 1
-                            shape_info["reason"] = "TitleTextShape"
-                            all_title_shapes.append(shape_info)
-                            logging.info(
-                                f"  Found TitleTextShape at index {i} (priority 1)"
-                            )
-                            continue
-
-                        # Skip content shapes explicitly
-                        if shape_type == "com.sun.star.presentation.OutlinerShape":
-                            logging.info(f"  Skipping content shape at index {i}")
-                            continue
-
-                        # Priority 2: Check PresentationObject for title placeholders
-                        try:
-                            if hasattr(shape, "PresentationObject"):
-                                pres_obj = shape.PresentationObject
-                                logging.info(f"  PresentationObject: {pres_obj}")
-
-                                # Title placeholders (0 = title, 1 = subtitle)
-                                if pres_obj in [0, 1]:
-                                    shape_info["priority"] = 2
-                                    shape_info["reason"] = (
-                                        f"PresentationObject-{pres_obj}"
-                                    )
-                                    all_title_shapes.append(shape_info)
-                                    logging.info(
-                                        f"  Found title placeholder at index {i} (priority 2)"
-                                    )
-                                    continue
-                        except Exception as pres_obj_error:
-                            logging.warning(
-                                f"  Error checking PresentationObject: {pres_obj_error}"
-                            )
-
-                        # Priority 3: Regular TextShape that might be a title
-                        if shape_type == "com.sun.star.drawing.TextShape":
-                            # Check position - titles are usually at the top
-                            if hasattr(shape, "Position"):
-                                y_pos = shape.Position.Y
-                                if y_pos < 3000:  # Top area - likely title
-                                    shape_info["priority"] = 3
-                                    shape_info["reason"] = f"TextShape-top-Y{y_pos}"
-                                    all_title_shapes.append(shape_info)
-                                    logging.info(
-                                        f"  Found TextShape at top at index {i} (priority 3)"
-                                    )
-                                    continue
-
-                        # Priority 4: Check shape name for title indicators
-                        if hasattr(shape, "Name"):
-                            shape_name = shape.Name.lower()
-                            logging.info(f"  Shape name: '{shape_name}'")
-
-                            # Skip if name suggests it's content
-                            if any(
-                                keyword in shape_name
-                                for keyword in ["content", "body", "outline"]
-                            ):
-                                logging.info(
-                                    f"  Skipping shape with content-related name"
-                                )
-                                continue
-
-                            # Prefer shapes with title-related names
-                            if any(
-                                keyword in shape_name
-                                for keyword in ["title", "heading", "header"]
-                            ):
-                                shape_info["priority"] = 4
-                                shape_info["reason"] = f"name-{shape_name}"
-                                all_title_shapes.append(shape_info)
-                                logging.info(
-                                    f"  Found title shape by name at index {i} (priority 4)"
-                                )
-                                continue
 
-                        # Priority 5: Position-based detection for top area shapes
-                        if hasattr(shape, "Position"):
-                            y_pos = shape.Position.Y
+            roles_map = load_slide_roles(file_path)
+            roles = get_slide_roles(roles_map, target_slide, slide_index)
+            content_shape, _ = pick_slide_shape(target_slide, roles["content"])
+            if not content_shape:
+                raise HelperError(f"Slide {slide_index} has no content shape")
+
+            text_obj = content_shape.getText()
+            paragraphs = list_text_paragraphs(text_obj)
+            paragraph_count = len(paragraphs)
+
+            # Validate every operation before changing anything
+            ordered = []
+            changed = set()
+            for position, operation in enumerate(operations):
+                action = operation.get("action")
+                index = operation.get("index")
+                if action not in BULLET_ACTIONS:
+                    raise HelperError(
+                        f"Unknown bullet action '{action}'. Choose from: {BULLET_ACTIONS}"
+                    )
+                limit = paragraph_count + 1 if action == "insert" else paragraph_count
+                if not isinstance(index, int) or index < 0 or index >= limit:
+                    raise HelperError(
+                        f"Paragraph index {index} is out of range for {action}"
+                    )
+                if action != "delete" and operation.get("text") is None:
+                    raise HelperError(f"Bullet {action} at {index} needs text")
+                if action != "insert":
+                    if index in changed:
+                        raise HelperError(
+                            f"Paragraph {index} is replaced or deleted more than once"
+                        )
+                    changed.add(index)
+                # Work backwards so earlier paragraphs keep their indices; at the
+                # same index, replace/delete go before inserts, which run in reverse
+                if action == "insert":
+                    ordered.append(((index, 0, position), operation))
+                else:
+                    ordered.append(((index, 1, 0), operation))
+            ordered.sort(key=lambda item: item[0], reverse=True)
+
+            counts = {action: 0 for action in BULLET_ACTIONS}
+            for _, operation in ordered:
+                apply_bullet_operation(text_obj, paragraphs, paragraph_count, operation)
+                if operation["action"] == "insert":
+                    paragraph_count += 1
+                elif operation["action"] == "delete" and paragraph_count > 1:
+                    paragraph_count -= 1
+                counts[operation["action"]] += 1
 
-                            # Get existing text content
-                            try:
-                                text_obj = shape.getText()
-                                existing_text = (
-                                    text_obj.getString()
-                                    if hasattr(text_obj, "getString")
-                                    else ""
-                                )
-                            except:
-                                existing_text = ""
+            # Save and close
+            logging.info("Saving document...")
+            store_document(doc)
+            # Roles can depend on shape text, so this slide is re-ranked next
+            # time; the other slides keep theirs under the new file signature
+            roles_map.pop(slide_index, None)
+            set_cached(file_path, "slide_roles", roles_map)
 
-                            # Title area detection (top area of slide)
-                            if y_pos < 3000:  # Likely title area
-                                priority = 5
-                                # Boost priority if shape has existing text that looks like a title
-                                if (
-                                    existing_text.strip()
-                                    and len(existing_text.strip()) < 100
-                                ):  # Short text, likely title
-                                    priority = 4
-                                    shape_info["reason"] = (
-                                        f"position-with-title-text-Y{y_pos}"
-                                    )
-                                else:
-                                    shape_info["reason"] = f"position-top-Y{y_pos}"
+            success_msg = f"Edited bullets on slide {slide_index} in {file_path}: {counts['insert']} inserted, {counts['replace']} replaced, {counts['delete']} deleted. Content now has {len(list_text_paragraphs(text_obj))} paragraphs."
+            logging.info(success_msg)
+            return success_msg
 
-                                shape_info["priority"] = priority
-                                all_title_shapes.append(shape_info)
-                                logging.info(
-                                    f"  Found title shape by position at index {i} (priority {priority})"
-                                )
 
-                        # Priority 6: Any other text-capable shape as final fallback (but only if in top half)
-                        if (
-                            hasattr(shape, "Position") and shape.Position.Y < 10000
-                        ):  # Top half of slide
-                            if not any(
-                                info["shape"] == shape for info in all_title_shapes
-                            ):
-                                shape_info["priority"] = 6
-                                shape_info["reason"] = "fallback-text-capable-top-half"
-                                all_title_shapes.append(shape_info)
-                                logging.info(
-                                    f"  Added fallback title shape at index {i} (priority 6)"
-                                )
+def edit_slide_title(file_path, slide_index, new_title):
+    """
+    Edit the title of a specific slide in an Impress presentation.
+    """
+    logging.info(
+        f"edit_slide_title called with: file_path={file_path}, slide_index={slide_index}"
+    )
 
-                except Exception as shape_error:
-                    logging.warning(f"  Error examining shape {i}: {shape_error}")
+    with managed_document(file_path) as doc:
+        if valid_presentation(doc):
+            draw_pages = doc.getDrawPages()
 
-            # Sort by priority (lower number = higher priority) and select the best match
-            if all_title_shapes:
-                all_title_shapes.sort(key=lambda x: (x["priority"], x["index"]))
-                best_match = all_title_shapes[0]
-                main_title_shape = best_match["shape"]
-                logging.info(
-                    f"Selected title shape at index {best_match['index']} with priority {best_match['priority']} (reason: {best_match['reason']})"
-                )
+            target_slide = get_validated_slide(draw_pages, slide_index)
+            logging.info(f"Editing title of slide at index: {slide_index}")
 
-                # Log all candidates for debugging
-                logging.info("All title shape candidates:")
-                for info in all_title_shapes:
-                    logging.info(
-                        f"  Index {info['index']}: Priority {info['priority']}, Reason: {info['reason']}, Type: {info['type']}"
-                    )
+            # Find the title shape using the shared shape classifier
+            roles_map = load_slide_roles(file_path)
+            roles = get_slide_roles(roles_map, target_slide, slide_index)
+            main_title_shape, _ = pick_slide_shape(target_slide, roles["title"])
 
             # If still no title shape found, create one
             if not main_title_shape:
@@ -1726,6 +2901,8 @@ def edit_slide_title(file_path, slide_index, new_title):
                     target_slide.add(title_shape)
                     main_title_shape = title_shape
                     logging.info("Created and added new title textbox to slide")
+                    # The slide has a new shape, so its roles must be reclassified
+                    roles_map.pop(slide_index, None)
 
                 except Exception as create_error:
                     error_msg = f"Failed to create title textbox: {create_error}"
@@ -1758,96 +2935,258 @@ def edit_slide_title(file_path, slide_index, new_title):
                     logging.error(error_msg)
                     edit_result = "Title update failed - verification error"
 
-                # Apply basic formatting for title readability
-                try:
-                    text_cursor = text_obj.createTextCursor()
-                    text_cursor.gotoStart(False)
-                    text_cursor.gotoEnd(True)
-                    text_cursor.CharHeight = 28  # Larger font for title
-                    text_cursor.CharWeight = 150  # Bold
-                    text_cursor.ParaAdjust = CENTER  # Center alignment for title
-                    logging.info("Applied formatting to title text")
-                except Exception as format_error:
-                    logging.warning(f"Could not apply formatting: {format_error}")
+                # Apply basic formatting for title readability
+                try:
+                    text_cursor = text_obj.createTextCursor()
+                    text_cursor.gotoStart(False)
+                    text_cursor.gotoEnd(True)
+                    text_cursor.CharHeight = 28  # Larger font for title
+                    text_cursor.CharWeight = 150  # Bold
+                    text_cursor.ParaAdjust = CENTER  # Center alignment for title
+                    logging.info("Applied formatting to title text")
+                except Exception as format_error:
+                    logging.warning(f"Could not apply formatting: {format_error}")
+
+            except Exception as edit_error:
+                error_msg = f"Failed to edit title shape: {edit_error}"
+                logging.error(error_msg)
+                raise HelperError(error_msg)
+
+            # Save and close
+            logging.info("Saving document...")
+            store_document(doc)
+            # Roles can depend on shape text, so this slide is re-ranked next
+            # time; the other slides keep theirs under the new file signature
+            roles_map.pop(slide_index, None)
+            set_cached(file_path, "slide_roles", roles_map)
+
+            success_msg = f"Successfully edited title of slide {slide_index} in {file_path}. {edit_result}"
+            logging.info(success_msg)
+            return success_msg
+
+
+def delete_slide(file_path, slide_index):
+    """
+    Delete a slide from an Impress presentation.
+    Args:
+        file_path: Path to the presentation file.
+        slide_index: Index of the slide to delete (0-based).
+    """
+    logging.info(
+        f"delete_slide called with: file_path={file_path}, slide_index={slide_index}"
+    )
+
+    with managed_document(file_path) as doc:
+        if valid_presentation(doc):
+            draw_pages = doc.getDrawPages()
+            num_slides = draw_pages.getCount()
+
+            # Get the slide to delete
+            slide_to_delete = get_validated_slide(draw_pages, slide_index, delete=True)
+            logging.info(f"Deleting slide at index: {slide_index}")
+
+            # Remove the slide
+            draw_pages.remove(slide_to_delete)
+            logging.info("Slide removed successfully")
+
+            # Verify the slide was deleted
+            new_slide_count = draw_pages.getCount()
+            if new_slide_count != num_slides - 1:
+                error_msg = f"Slide deletion verification failed: expected {num_slides - 1} slides, got {new_slide_count}"
+                logging.error(error_msg)
+                raise HelperError(error_msg)
+
+            # Save and close
+            logging.info("Saving document...")
+            store_document(doc)
+
+            success_msg = f"Successfully deleted slide at index {slide_index} from {file_path}. Presentation now has {new_slide_count} slides."
+            logging.info(success_msg)
+            return success_msg
+
+
+def validate_slide_indices(slide_indices, num_slides):
+    """Normalise a slide index or list of indices, rejecting duplicates and out-of-range values."""
+    if isinstance(slide_indices, int):
+        slide_indices = [slide_indices]
+    if not slide_indices:
+        raise HelperError("No slide indices provided")
+    indices = [int(index) for index in slide_indices]
+    for index in indices:
+        if index < 0 or index >= num_slides:
+            raise HelperError(f"Slide index {index} is out of range")
+    if len(set(indices)) != len(indices):
+        raise HelperError("Slide indices must not repeat")
+    return indices
+
+
+def reorder_slides(doc, slides, target_index):
+    """
+    Move slides so they sit together, in the given order, starting at target_index.
+
+    The remaining slides keep their relative order. The Impress API has no way
+    to move a page, so pages are moved with the MovePageFirst/MovePageLast
+    slots on the current page, at most one dispatch per slide. The slots act
+    on the view's page selection, so every move and the final slide order are
+    checked against the model.
+    """
+    draw_pages = doc.getDrawPages()
+    num_slides = draw_pages.getCount()
+    if all(slide.Number - 1 == target_index + i for i, slide in enumerate(slides)):
+        return
+
+    moving = {slide.Number - 1 for slide in slides}
+    remaining = [draw_pages.getByIndex(i) for i in range(num_slides) if i not in moving]
+    final_order = remaining[:target_index] + slides + remaining[target_index:]
+
+    ctx = uno.getComponentContext()
+    dispatcher = ctx.ServiceManager.createInstanceWithContext(
+        "com.sun.star.frame.DispatchHelper", ctx
+    )
+    controller = doc.getCurrentController()
+    frame = controller.getFrame()
+
+    def move(slide, command, expected_number):
+        controller.setCurrentPage(slide)
+        dispatcher.executeDispatch(frame, command, "", 0, ())
+        if slide.Number != expected_number:
+            raise HelperError(
+                f"Slide reorder failed: {command} left the slide at index {slide.Number - 1}"
+            )
+
+    # The slots need a live view, so let the controllers run while moving
+    relock = hasattr(doc, "hasControllersLocked") and doc.hasControllersLocked()
+    if relock:
+        doc.unlockControllers()
+    try:
+        # Either pull the head of the final order to the front, last slide
+        # first, or push its tail to the end in order, whichever is shorter
+        head_length = target_index + len(slides)
+        if head_length <= num_slides - target_index:
+            for slide in reversed(final_order[:head_length]):
+                move(slide, ".uno:MovePageFirst", 1)
+        else:
+            for slide in final_order[target_index:]:
+                move(slide, ".uno:MovePageLast", num_slides)
+    finally:
+        if relock:
+            doc.lockControllers()
+
+    actual_order = [slide.Number - 1 for slide in final_order]
+    if actual_order != list(range(num_slides)):
+        error_msg = (
+            f"Slide reorder verification failed: slides ended up at {actual_order}"
+        )
+        logging.error(error_msg)
+        raise HelperError(error_msg)
+
+
+def move_slides(file_path, slide_indices, target_index):
+    """
+    Move one or more slides to a new position in a single store.
+    Args:
+        file_path: Path to the presentation file.
+        slide_indices: Slide index or list of indices to move (0-based), in the
+            order they should appear.
+        target_index: Index the first moved slide ends up at, counted in the
+            final slide order.
+    """
+    logging.info(
+        f"move_slides called with: file_path={file_path}, slide_indices={slide_indices}, target_index={target_index}"
+    )
+
+    with managed_document(file_path) as doc:
+        if valid_presentation(doc):
+            draw_pages = doc.getDrawPages()
+            num_slides = draw_pages.getCount()
+            indices = validate_slide_indices(slide_indices, num_slides)
+            if target_index < 0 or target_index > num_slides - len(indices):
+                raise HelperError(
+                    f"Target index {target_index} is out of range for moving {len(indices)} slides"
+                )
 
-            except Exception as edit_error:
-                error_msg = f"Failed to edit title shape: {edit_error}"
-                logging.error(error_msg)
-                raise HelperError(error_msg)
+            roles_map = load_slide_roles(file_path)
+            slides = [draw_pages.getByIndex(index) for index in indices]
+            reorder_slides(doc, slides, target_index)
+
+            # Carry the cached shape roles over to the new slide positions
+            remaining = [i for i in range(num_slides) if i not in indices]
+            old_order = remaining[:target_index] + indices + remaining[target_index:]
+            moved_roles = {
+                new_index: roles_map[old_index]
+                for new_index, old_index in enumerate(old_order)
+                if old_index in roles_map
+            }
 
             # Save and close
             logging.info("Saving document...")
-            doc.store()
+            store_document(doc)
+            set_cached(file_path, "slide_roles", moved_roles)
 
-            success_msg = f"Successfully edited title of slide {slide_index} in {file_path}. {edit_result}"
+            success_msg = (
+                f"Moved slides {indices} to index {target_index} in {file_path}"
+            )
             logging.info(success_msg)
             return success_msg
 
 
-def delete_slide(file_path, slide_index):
+def duplicate_slides(file_path, slide_indices, target_index=None):
     """
-    Delete a slide from an Impress presentation.
+    Duplicate one or more slides in a single store.
     Args:
         file_path: Path to the presentation file.
-        slide_index: Index of the slide to delete (0-based).
+        slide_indices: Slide index or list of indices to duplicate (0-based).
+        target_index: Index the first copy ends up at, counted in the final
+            slide order. If None, each copy follows its original slide.
     """
     logging.info(
-        f"delete_slide called with: file_path={file_path}, slide_index={slide_index}"
+        f"duplicate_slides called with: file_path={file_path}, slide_indices={slide_indices}, target_index={target_index}"
     )
 
     with managed_document(file_path) as doc:
         if valid_presentation(doc):
             draw_pages = doc.getDrawPages()
             num_slides = draw_pages.getCount()
+            indices = validate_slide_indices(slide_indices, num_slides)
+            if target_index is not None and (
+                target_index < 0 or target_index > num_slides
+            ):
+                raise HelperError(f"Target index {target_index} is out of range")
 
-            # Get the slide to delete
-            slide_to_delete = get_validated_slide(draw_pages, slide_index, delete=True)
-            logging.info(f"Deleting slide at index: {slide_index}")
-
-            # Remove the slide
-            draw_pages.remove(slide_to_delete)
-            logging.info("Slide removed successfully")
+            # duplicate() inserts each copy directly after its original
+            originals = [draw_pages.getByIndex(index) for index in indices]
+            copies = [doc.duplicate(original) for original in originals]
 
-            # Verify the slide was deleted
-            new_slide_count = draw_pages.getCount()
-            if new_slide_count != num_slides - 1:
-                error_msg = f"Slide deletion verification failed: expected {num_slides - 1} slides, got {new_slide_count}"
-                logging.error(error_msg)
-                raise HelperError(error_msg)
+            if target_index is not None:
+                reorder_slides(doc, copies, target_index)
 
             # Save and close
             logging.info("Saving document...")
-            doc.store()
+            store_document(doc)
 
-            success_msg = f"Successfully deleted slide at index {slide_index} from {file_path}. Presentation now has {new_slide_count} slides."
+            positions = [copy.Number - 1 for copy in copies]
+            success_msg = f"Duplicated slides {indices} to indices {positions} in {file_path}. Presentation now has {draw_pages.getCount()} slides."
             logging.info(success_msg)
             return success_msg
 
 
-def apply_presentation_template(file_path, template_name):
-    """Apply a presentation template to an existing presentation."""
-    logging.info(f"Attempting to apply template: {template_name} to {file_path}")
-
-    home_dir = os.path.expanduser("~")
+def load_template_copy(template_name):
+    """
+    Create a hidden, untitled presentation from the first catalogued template
+    with the given name that LibreOffice can load.
 
-    # Define search directories for templates
-    template_search_dirs = [
-        "C:/Program Files/LibreOffice/share/template/common/presnt",
-        f"{home_dir}/AppData/Roaming/LibreOffice/4/user/template",
+    Templates that fail to load while LibreOffice is reachable are marked
+    invalid in the catalog, so they are tried last next time.
+    """
+    desktop = get_uno_desktop()
+    if not desktop:
+        raise HelperError("Failed to connect to LibreOffice desktop")
+    props = [
+        create_property_value("AsTemplate", True),
+        create_property_value("Hidden", True),
     ]
 
-    template_doc = None
-    found_template_path = None
-
-    # Search recursively in user directories
-    all_found_templates = []
-    for search_dir in template_search_dirs:
-        logging.info(f"Recursively searching directory: {search_dir}")
-        found_templates = find_template_files(search_dir, template_name)
-        all_found_templates.extend(found_templates)
-
-    # Try to load each found template until one works
-    for template_path in all_found_templates:
+    for template_path in find_template_files(template_name):
         try:
             logging.info(f"Trying user template: {template_path}")
             # Convert to file URL if it's a local path
@@ -1856,31 +3195,49 @@ def apply_presentation_template(file_path, template_name):
             else:
                 template_url = template_path
 
-            with managed_document(template_path, read_only=True) as template_doc:
-                if template_doc:
-                    found_template_path = template_url
-                    logging.info(
-                        f"Successfully loaded user template from: {template_path}"
-                    )
-                    break
+            new_doc = desktop.loadComponentFromURL(
+                template_url, "_blank", 0, tuple(props)
+            )
+            if not new_doc:
+                raise HelperError(f"Failed to load template: {template_path}")
+            if not hasattr(new_doc, "getMasterPages"):
+                new_doc.close(True)
+                raise HelperError(f"Not a presentation template: {template_path}")
+            set_template_validity(template_path, True)
+            logging.info(f"Created new document from template: {template_path}")
+            return new_doc
+        except (IllegalArgumentException, IOException, HelperError) as load_error:
+            # Only blame the template if LibreOffice is still reachable
+            if not get_uno_desktop():
+                raise HelperError("Failed to connect to LibreOffice desktop")
+            logging.info(f"Failed to load template from {template_path}: {load_error}")
+            set_template_validity(template_path, False)
         except Exception as template_error:
+            # Bridge and runtime errors say nothing about the template file
             logging.info(
                 f"Failed to load template from {template_path}: {template_error}"
             )
-            continue
 
-    if not template_doc:
-        # Create a detailed error message with search information
-        search_summary = "Searched in the following locations:\n"
-        for search_dir in template_search_dirs:
-            if os.path.exists(search_dir):
-                search_summary += f"  - {search_dir} (exists)\n"
-            else:
-                search_summary += f"  - {search_dir} (not found)\n"
+    # Create a detailed error message with search information
+    search_summary = "Searched in the following locations:\n"
+    for search_dir in get_template_catalog()["roots"]:
+        if os.path.exists(search_dir):
+            search_summary += f"  - {search_dir} (exists)\n"
+        else:
+            search_summary += f"  - {search_dir} (not found)\n"
 
-        error_msg = f"Could not find template '{template_name}' in any location.\n{search_summary}"
-        error_msg += f"Template files searched for: {template_name}.otp, {template_name}.ott, etc."
-        raise HelperError(error_msg)
+    error_msg = (
+        f"Could not find template '{template_name}' in any location.\n{search_summary}"
+    )
+    error_msg += (
+        f"Template files searched for: {template_name}.otp, {template_name}.ott, etc."
+    )
+    raise HelperError(error_msg)
+
+
+def apply_presentation_template(file_path, template_name):
+    """Apply a presentation template to an existing presentation."""
+    logging.info(f"Attempting to apply template: {template_name} to {file_path}")
 
     # Load target presentation using the helper
     with managed_document(file_path) as target_doc:
@@ -1891,25 +3248,8 @@ def apply_presentation_template(file_path, template_name):
             # Create new presentation from template and copy content
             try:
                 logging.info("Creating new presentation from template...")
-
-                # Get desktop
-                desktop = get_uno_desktop()
-                if not desktop:
-                    raise HelperError("Failed to get UNO desktop")
-
-                # Create new document from template
-                props = [
-                    create_property_value("AsTemplate", True),
-                    create_property_value("Hidden", True),
-                ]
-
-                new_doc = desktop.loadComponentFromURL(
-                    found_template_path, "_blank", 0, tuple(props)
-                )
-                if not new_doc:
-                    raise HelperError("Failed to create new document from template")
-
-                logging.info("Created new document from template")
+                new_doc = load_template_copy(template_name)
+                lock_document(new_doc)
 
                 # Get slides from target and new document
                 target_slides = target_doc.getDrawPages()
@@ -1972,26 +3312,13 @@ def apply_presentation_template(file_path, template_name):
 
                     target_slide_layouts.append(needed_layout)
 
-                # Determine the template's default layout
-                template_layout = None
+                # The template's first slide gives its default layout
+                template_layout = 1  # Default to TitleContent
                 if new_slide_count > 0:
-                    try:
-                        first_template_slide = new_slides.getByIndex(0)
-                        if hasattr(first_template_slide, "Layout"):
-                            template_layout = first_template_slide.Layout
-                            logging.info(
-                                f"Template default layout detected: {template_layout}"
-                            )
-                        else:
-                            template_layout = 1  # Default to TitleContent
-                            logging.info(
-                                "Could not detect template layout, defaulting to TitleContent"
-                            )
-                    except Exception as layout_detect_error:
-                        logging.warning(
-                            f"Could not detect template layout: {layout_detect_error}"
-                        )
-                        template_layout = 1  # Default to TitleContent layout
+                    first_template_slide = new_slides.getByIndex(0)
+                    if hasattr(first_template_slide, "Layout"):
+                        template_layout = first_template_slide.Layout
+                logging.info(f"Template default layout: {template_layout}")
 
                 # Add more slides to new document if needed, with appropriate layouts
                 while new_slide_count < target_slide_count:
@@ -2313,6 +3640,7 @@ def apply_presentation_template(file_path, template_name):
                 save_props = [create_property_value("Overwrite", True)]
 
                 try:
+                    release_document_locks(new_doc)
                     new_doc.storeToURL(file_url, tuple(save_props))
                     logging.info("Successfully saved new document over target file")
                 except Exception as save_error:
@@ -2333,6 +3661,7 @@ def apply_presentation_template(file_path, template_name):
                 # Clean up documents
                 try:
                     if new_doc:
+                        release_document_locks(new_doc)
                         new_doc.close(True)
                         logging.info("Closed new document")
                 except:
@@ -2377,105 +3706,13 @@ def format_slide_content(file_path, slide_index, format_options):
             target_slide = get_validated_slide(draw_pages, slide_index)
             logging.info(f"Formatting content of slide at index: {slide_index}")
 
-            # Find the main content shape using similar logic as edit_slide_content
-            main_content_shape = None
-            all_text_shapes = []
-
-            logging.info(f"Number of shapes on slide: {target_slide.getCount()}")
-
-            # Collect all text-capable shapes and categorize them
-            for i in range(target_slide.getCount()):
-                try:
-                    shape = target_slide.getByIndex(i)
-                    shape_type = shape.getShapeType()
-                    logging.info(f"Shape {i}: {shape_type}")
-
-                    if hasattr(shape, "getText"):
-                        shape_info = {
-                            "shape": shape,
-                            "index": i,
-                            "type": shape_type,
-                            "priority": 99,
-                            "reason": "unknown",
-                        }
-
-                        # Priority 1: Standard presentation OutlinerShape (highest priority)
-                        if shape_type == "com.sun.star.presentation.OutlinerShape":
-                            shape_info["priority"] = 1
-                            shape_info["reason"] = "OutlinerShape"
-                            all_text_shapes.append(shape_info)
-                            logging.info(
-                                f"  Found OutlinerShape at index {i} (priority 1)"
-                            )
-                            continue
-
-                        # Skip title shapes explicitly
-                        if shape_type == "com.sun.star.presentation.TitleTextShape":
-                            logging.info(f"  Skipping title shape at index {i}")
-                            continue
-
-                        # Priority 2: Check PresentationObject for content placeholders
-                        try:
-                            if hasattr(shape, "PresentationObject"):
-                                pres_obj = shape.PresentationObject
-                                if pres_obj in [2, 3, 4, 5]:  # Content placeholders
-                                    shape_info["priority"] = 2
-                                    shape_info["reason"] = (
-                                        f"PresentationObject-{pres_obj}"
-                                    )
-                                    all_text_shapes.append(shape_info)
-                                    logging.info(
-                                        f"  Found content placeholder at index {i} (priority 2)"
-                                    )
-                                    continue
-                        except Exception as pres_obj_error:
-                            logging.warning(
-                                f"  Error checking PresentationObject: {pres_obj_error}"
-                            )
-
-                        # Priority 3: Regular TextShape
-                        if shape_type == "com.sun.star.drawing.TextShape":
-                            shape_info["priority"] = 3
-                            shape_info["reason"] = "TextShape"
-                            all_text_shapes.append(shape_info)
-                            logging.info(f"  Found TextShape at index {i} (priority 3)")
-                            continue
-
-                        # Priority 4: Check shape name for content indicators
-                        if hasattr(shape, "Name"):
-                            shape_name = shape.Name.lower()
-                            if "title" not in shape_name and any(
-                                keyword in shape_name
-                                for keyword in ["content", "text", "outline", "body"]
-                            ):
-                                shape_info["priority"] = 4
-                                shape_info["reason"] = f"name-{shape_name}"
-                                all_text_shapes.append(shape_info)
-                                logging.info(
-                                    f"  Found content shape by name at index {i} (priority 4)"
-                                )
-                                continue
-
-                        # Priority 5: Position-based detection (below title area)
-                        if hasattr(shape, "Position") and shape.Position.Y > 3000:
-                            shape_info["priority"] = 5
-                            shape_info["reason"] = f"position-Y{shape.Position.Y}"
-                            all_text_shapes.append(shape_info)
-                            logging.info(
-                                f"  Found text shape by position at index {i} (priority 5)"
-                            )
-
-                except Exception as shape_error:
-                    logging.warning(f"  Error examining shape {i}: {shape_error}")
-
-            # Select the best content shape
-            if all_text_shapes:
-                all_text_shapes.sort(key=lambda x: (x["priority"], x["index"]))
-                best_match = all_text_shapes[0]
-                main_content_shape = best_match["shape"]
-                logging.info(
-                    f"Selected content shape at index {best_match['index']} with priority {best_match['priority']}"
-                )
+            # Find the main content shape using the shared shape classifier,
+            # ignoring the catch-all fallback candidates
+            roles_map = load_slide_roles(file_path)
+            roles = get_slide_roles(roles_map, target_slide, slide_index)
+            main_content_shape, _ = pick_slide_shape(
+                target_slide, roles["content"], max_priority=5
+            )
 
             if not main_content_shape:
                 error_msg = f"No content shape found on slide {slide_index}"
@@ -2580,7 +3817,9 @@ def format_slide_content(file_path, slide_index, format_options):
 
             # Save document
             logging.info("Saving document...")
-            doc.store()
+            store_document(doc)
+            # Formatting leaves every shape's role unchanged
+            set_cached(file_path, "slide_roles", roles_map)
 
             # Build success message with applied formatting details
             applied_formats = []
@@ -2622,112 +3861,13 @@ def format_slide_title(file_path, slide_index, format_options):
             target_slide = get_validated_slide(draw_pages, slide_index)
             logging.info(f"Formatting title of slide at index: {slide_index}")
 
-            # Find the main title shape using similar logic as edit_slide_title
-            main_title_shape = None
-            all_title_shapes = []
-
-            logging.info(f"Number of shapes on slide: {target_slide.getCount()}")
-
-            # Collect all text-capable shapes and categorize them for title detection
-            for i in range(target_slide.getCount()):
-                try:
-                    shape = target_slide.getByIndex(i)
-                    shape_type = shape.getShapeType()
-                    logging.info(f"Shape {i}: {shape_type}")
-
-                    if hasattr(shape, "getText"):
-                        shape_info = {
-                            "shape": shape,
-                            "index": i,
-                            "type": shape_type,
-                            "priority": 99,
-                            "reason": "unknown",
-                        }
-
-                        # Priority 1: Standard presentation TitleTextShape (highest priority)
-                        if shape_type == "com.sun.star.presentation.TitleTextShape":
-                            shape_info["priority"] = 1
-                            shape_info["reason"] = "TitleTextShape"
-                            all_title_shapes.append(shape_info)
-                            logging.info(
-                                f"  Found TitleTextShape at index {i} (priority 1)"
-                            )
-                            continue
-
-                        # Skip content shapes explicitly
-                        if shape_type == "com.sun.star.presentation.OutlinerShape":
-                            logging.info(f"  Skipping content shape at index {i}")
-                            continue
-
-                        # Priority 2: Check PresentationObject for title placeholders
-                        try:
-                            if hasattr(shape, "PresentationObject"):
-                                pres_obj = shape.PresentationObject
-                                if pres_obj in [0, 1]:  # Title placeholders
-                                    shape_info["priority"] = 2
-                                    shape_info["reason"] = (
-                                        f"PresentationObject-{pres_obj}"
-                                    )
-                                    all_title_shapes.append(shape_info)
-                                    logging.info(
-                                        f"  Found title placeholder at index {i} (priority 2)"
-                                    )
-                                    continue
-                        except Exception as pres_obj_error:
-                            logging.warning(
-                                f"  Error checking PresentationObject: {pres_obj_error}"
-                            )
-
-                        # Priority 3: Regular TextShape in top area
-                        if shape_type == "com.sun.star.drawing.TextShape":
-                            if (
-                                hasattr(shape, "Position") and shape.Position.Y < 3000
-                            ):  # Top area
-                                shape_info["priority"] = 3
-                                shape_info["reason"] = (
-                                    f"TextShape-top-Y{shape.Position.Y}"
-                                )
-                                all_title_shapes.append(shape_info)
-                                logging.info(
-                                    f"  Found TextShape at top at index {i} (priority 3)"
-                                )
-                                continue
-
-                        # Priority 4: Check shape name for title indicators
-                        if hasattr(shape, "Name"):
-                            shape_name = shape.Name.lower()
-                            if any(
-                                keyword in shape_name
-                                for keyword in ["title", "heading", "header"]
-                            ):
-                                shape_info["priority"] = 4
-                                shape_info["reason"] = f"name-{shape_name}"
-                                all_title_shapes.append(shape_info)
-                                logging.info(
-                                    f"  Found title shape by name at index {i} (priority 4)"
-                                )
-                                continue
-
-                        # Priority 5: Position-based detection for top area shapes
-                        if hasattr(shape, "Position") and shape.Position.Y < 3000:
-                            shape_info["priority"] = 5
-                            shape_info["reason"] = f"position-top-Y{shape.Position.Y}"
-                            all_title_shapes.append(shape_info)
-                            logging.info(
-                                f"  Found title shape by position at index {i} (priority 5)"
-                            )
-
-                except Exception as shape_error:
-                    logging.warning(f"  Error examining shape {i}: {shape_error}")
-
-            # Select the best title shape
-            if all_title_shapes:
-                all_title_shapes.sort(key=lambda x: (x["priority"], x["index"]))
-                best_match = all_title_shapes[0]
-                main_title_shape = best_match["shape"]
-                logging.info(
-                    f"Selected title shape at index {best_match['index']} with priority {best_match['priority']}"
-                )
+            # Find the title shape using the shared shape classifier,
+            # ignoring the catch-all fallback candidates
+            roles_map = load_slide_roles(file_path)
+            roles = get_slide_roles(roles_map, target_slide, slide_index)
+            main_title_shape, _ = pick_slide_shape(
+                target_slide, roles["title"], max_priority=5
+            )
 
             if not main_title_shape:
                 error_msg = f"No title shape found on slide {slide_index}"
@@ -2830,7 +3970,9 @@ def format_slide_title(file_path, slide_index, format_options):
 
             # Save document
             logging.info("Saving document...")
-            doc.store()
+            store_document(doc)
+            # Formatting leaves every shape's role unchanged
+            set_cached(file_path, "slide_roles", roles_map)
 
             # Build success message with applied formatting details
             applied_formats = []
@@ -2843,6 +3985,205 @@ def format_slide_title(file_path, slide_index, format_options):
             return success_msg
 
 
+def place_slide_image(
+    doc,
+    target_slide,
+    image_path,
+    max_width=None,
+    max_height=None,
+    img_width_px=None,
+    img_height_px=None,
+    dpi=None,
+    optimize_dpi=None,
+):
+    """
+    Add an image shape to a slide, scaled to fit and centered.
+    If optimize_dpi is set, the image is resampled for its display size first.
+    Returns the final (width, height) of the image in 1/100mm.
+    """
+    # Get slide dimensions (LibreOffice uses 1/100mm units internally)
+    slide_width = 25400  # Standard slide width in 1/100mm (254mm = 10 inches)
+    slide_height = 19050  # Standard slide height in 1/100mm (190.5mm = 7.5 inches)
+
+    # Try to get actual slide dimensions from the slide master or page setup
+    try:
+        # Method 1: Try to get slide dimensions from the master page
+        if hasattr(target_slide, "getMasterPage"):
+            master_page = target_slide.getMasterPage()
+            if hasattr(master_page, "Width") and hasattr(master_page, "Height"):
+                slide_width = master_page.Width
+                slide_height = master_page.Height
+                logging.info(
+                    f"Got slide dimensions from master page: {slide_width}x{slide_height} (1/100mm)"
+                )
+
+        # Method 2: Try to get from the document's draw page size
+        elif hasattr(doc, "getDrawPageSize"):
+            page_size = doc.getDrawPageSize()
+            slide_width = page_size.Width
+            slide_height = page_size.Height
+            logging.info(
+                f"Got slide dimensions from draw page size: {slide_width}x{slide_height} (1/100mm)"
+            )
+
+    except Exception as size_error:
+        logging.warning(f"Could not get slide dimensions, using defaults: {size_error}")
+
+    # Log the parameters we received
+    logging.info(f"Input parameters: max_width={max_width}, max_height={max_height}")
+
+    # Set maximum dimensions with reasonable defaults (75% of slide for good visual balance)
+    if max_width is None:
+        max_width = int(slide_width * 0.75)
+    else:
+        # Ensure provided max_width doesn't exceed slide
+        max_width = min(max_width, int(slide_width * 0.9))
+
+    if max_height is None:
+        max_height = int(slide_height * 0.75)
+    else:
+        # Ensure provided max_height doesn't exceed slide
+        max_height = min(max_height, int(slide_height * 0.9))
+
+    logging.info(f"Slide dimensions: {slide_width}x{slide_height} (1/100mm)")
+    logging.info(f"Maximum image dimensions: {max_width}x{max_height} (1/100mm)")
+
+    if img_width_px and img_height_px:
+        info = {"width": img_width_px, "height": img_height_px, "dpi": None}
+    else:
+        # Read the pixel size and resolution straight from the image header
+        info = get_image_info(image_path)
+
+    if info:
+        # Convert pixels to LibreOffice units (1/100mm)
+        original_width, original_height = image_size_100mm(info, dpi)
+
+        logging.info(
+            f"Calculated image size: {original_width}x{original_height} (1/100mm) from {info['width']}x{info['height']} pixels"
+        )
+    else:
+        # Fallback: use reasonable default size
+        logging.warning("Could not get image size/DPI, using fallback dimensions")
+        original_width = max_width // 2
+        original_height = max_height // 2
+        logging.info(
+            f"Using fallback size: {original_width}x{original_height} (1/100mm)"
+        )
+
+    try:
+        # Create a graphics shape to hold the image
+        image_shape = doc.createInstance("com.sun.star.drawing.GraphicObjectShape")
+        if not image_shape:
+            raise HelperError("Failed to create graphics shape")
+
+        # Calculate scaling to fit within maximum dimensions while preserving aspect ratio
+        width_scale = max_width / original_width
+        height_scale = max_height / original_height
+        scale_factor = min(width_scale, height_scale, 1.0)  # Don't scale up, only down
+
+        new_width = int(original_width * scale_factor)
+        new_height = int(original_height * scale_factor)
+
+        # Ensure minimum size (at least 10mm x 10mm)
+        min_size = 1000  # 10mm in 1/100mm
+        if new_width < min_size:
+            new_width = min_size
+        if new_height < min_size:
+            new_height = min_size
+
+        logging.info(
+            f"Width scale: {width_scale:.3f}, Height scale: {height_scale:.3f}"
+        )
+        logging.info(f"Final scale factor: {scale_factor:.3f}")
+        logging.info(f"Final image size: {new_width}x{new_height} (1/100mm)")
+
+        if optimize_dpi:
+            image_path = optimize_image(image_path, new_width, new_height, optimize_dpi)
+
+        # Share one loaded graphic between all insertions of the same image
+        image_shape.Graphic = load_graphic(image_path)
+        logging.info(f"Image graphic: {image_path}")
+
+        # Set the size
+        new_size = Size(new_width, new_height)
+        image_shape.setSize(new_size)
+
+        # PROPER CENTERING FOR DRAWING SHAPES
+        # Calculate center position relative to slide
+        slide_center_x = slide_width // 2
+        slide_center_y = slide_height // 2
+
+        # Calculate top-left position to center the image
+        pos_x = slide_center_x - (new_width // 2)
+        pos_y = slide_center_y - (new_height // 2)
+
+        logging.info(f"Slide center: ({slide_center_x}, {slide_center_y})")
+        logging.info(f"Image half-size: ({new_width // 2}, {new_height // 2})")
+        logging.info(f"Calculated centered position: ({pos_x}, {pos_y})")
+
+        # Set the position using the Point structure
+        image_position = uno.createUnoStruct("com.sun.star.awt.Point")
+        image_position.X = pos_x
+        image_position.Y = pos_y
+        image_shape.setPosition(image_position)
+
+        # Verify positioning
+        actual_position = image_shape.getPosition()
+        logging.info(
+            f"Actual position after setting: ({actual_position.X}, {actual_position.Y})"
+        )
+
+        # Add the shape to the slide
+        target_slide.add(image_shape)
+
+        # Set additional properties for better image handling
+        try:
+            if hasattr(image_shape, "KeepAspectRatio"):
+                image_shape.KeepAspectRatio = True
+                logging.info("Set KeepAspectRatio property")
+
+            # For drawing shapes, we can also try to set transformation matrix for perfect centering
+            if hasattr(image_shape, "Transformation"):
+                # The transformation matrix can be used for more precise positioning
+                # This is an advanced feature but might help with centering
+                logging.info("Shape has Transformation property available")
+
+        except Exception as prop_error:
+            logging.warning(f"Could not set additional image properties: {prop_error}")
+
+        # Final verification of image bounds
+        final_position = image_shape.getPosition()
+        final_size = image_shape.getSize()
+        image_right = final_position.X + final_size.Width
+        image_bottom = final_position.Y + final_size.Height
+
+        logging.info("Final verification:")
+        logging.info(f"Image position: ({final_position.X}, {final_position.Y})")
+        logging.info(f"Image size: {final_size.Width}x{final_size.Height}")
+        logging.info(
+            f"Image bounds: X({final_position.X} to {image_right}), Y({final_position.Y} to {image_bottom})"
+        )
+        logging.info(f"Slide bounds: X(0 to {slide_width}), Y(0 to {slide_height})")
+
+        # Check if image is properly contained within slide
+        if (
+            final_position.X >= 0
+            and final_position.Y >= 0
+            and image_right <= slide_width
+            and image_bottom <= slide_height
+        ):
+            logging.info("Image is properly contained within slide boundaries")
+        else:
+            logging.warning("Image may extend beyond slide boundaries")
+
+    except Exception as image_error:
+        error_msg = f"Failed to create and configure image shape: {image_error}"
+        logging.error(error_msg)
+        raise HelperError(error_msg)
+
+    return new_width, new_height
+
+
 def insert_slide_image(
     file_path,
     slide_index,
@@ -2851,7 +4192,8 @@ def insert_slide_image(
     max_height=None,
     img_width_px=None,
     img_height_px=None,
-    dpi=96,
+    dpi=None,
+    optimize_dpi=None,
 ):
     """
     Insert an image into a specific slide of an Impress presentation.
@@ -2863,9 +4205,11 @@ def insert_slide_image(
         image_path: Path to the image file to insert.
         max_width: Maximum width in 1/100mm (defaults to slide width minus margins).
         max_height: Maximum height in 1/100mm (defaults to slide height minus margins).
-        img_width_px: Image width in pixels (for proper scaling calculation).
-        img_height_px: Image height in pixels (for proper scaling calculation).
-        dpi: Image DPI (for proper scaling calculation).
+        img_width_px: Image width in pixels (read from the image header if omitted).
+        img_height_px: Image height in pixels (read from the image header if omitted).
+        dpi: Image DPI (defaults to the resolution stored in the image, or 96).
+        optimize_dpi: If set, downscale and recompress the image to this
+            resolution at its display size before embedding.
     """
     logging.info(
         f"insert_slide_image called with: file_path={file_path}, slide_index={slide_index}, image_path={image_path}"
@@ -2883,207 +4227,21 @@ def insert_slide_image(
             target_slide = get_validated_slide(draw_pages, slide_index)
             logging.info(f"Inserting image into slide at index: {slide_index}")
 
-            # Get slide dimensions (LibreOffice uses 1/100mm units internally)
-            slide_width = 25400  # Standard slide width in 1/100mm (254mm = 10 inches)
-            slide_height = (
-                19050  # Standard slide height in 1/100mm (190.5mm = 7.5 inches)
-            )
-
-            # Try to get actual slide dimensions from the slide master or page setup
-            try:
-                # Method 1: Try to get slide dimensions from the master page
-                if hasattr(target_slide, "getMasterPage"):
-                    master_page = target_slide.getMasterPage()
-                    if hasattr(master_page, "Width") and hasattr(master_page, "Height"):
-                        slide_width = master_page.Width
-                        slide_height = master_page.Height
-                        logging.info(
-                            f"Got slide dimensions from master page: {slide_width}x{slide_height} (1/100mm)"
-                        )
-
-                # Method 2: Try to get from the document's draw page size
-                elif hasattr(doc, "getDrawPageSize"):
-                    page_size = doc.getDrawPageSize()
-                    slide_width = page_size.Width
-                    slide_height = page_size.Height
-                    logging.info(
-                        f"Got slide dimensions from draw page size: {slide_width}x{slide_height} (1/100mm)"
-                    )
-
-            except Exception as size_error:
-                logging.warning(
-                    f"Could not get slide dimensions, using defaults: {size_error}"
-                )
-
-            # Log the parameters we received
-            logging.info(
-                f"Input parameters: max_width={max_width}, max_height={max_height}"
-            )
-
-            # Set maximum dimensions with reasonable defaults (75% of slide for good visual balance)
-            if max_width is None:
-                max_width = int(slide_width * 0.75)
-            else:
-                # Ensure provided max_width doesn't exceed slide
-                max_width = min(max_width, int(slide_width * 0.9))
-
-            if max_height is None:
-                max_height = int(slide_height * 0.75)
-            else:
-                # Ensure provided max_height doesn't exceed slide
-                max_height = min(max_height, int(slide_height * 0.9))
-
-            logging.info(f"Slide dimensions: {slide_width}x{slide_height} (1/100mm)")
-            logging.info(
-                f"Maximum image dimensions: {max_width}x{max_height} (1/100mm)"
+            new_width, new_height = place_slide_image(
+                doc,
+                target_slide,
+                image_path,
+                max_width,
+                max_height,
+                img_width_px,
+                img_height_px,
+                dpi,
+                optimize_dpi,
             )
 
-            if img_width_px and img_height_px and dpi:
-                # Convert pixels to LibreOffice units (1/100mm)
-                mm_per_inch = 25.4
-                conversion_factor = (mm_per_inch * 100) / dpi  # 1/100mm per pixel
-
-                original_width = int(img_width_px * conversion_factor)
-                original_height = int(img_height_px * conversion_factor)
-
-                logging.info(
-                    f"Calculated image size: {original_width}x{original_height} (1/100mm) from {img_width_px}x{img_height_px} pixels at {dpi} DPI"
-                )
-            else:
-                # Fallback: use reasonable default size
-                logging.warning(
-                    "Could not get image size/DPI, using fallback dimensions"
-                )
-                original_width = max_width // 2
-                original_height = max_height // 2
-                logging.info(
-                    f"Using fallback size: {original_width}x{original_height} (1/100mm)"
-                )
-
-            try:
-                # Create a graphics shape to hold the image
-                image_shape = doc.createInstance(
-                    "com.sun.star.drawing.GraphicObjectShape"
-                )
-                if not image_shape:
-                    raise HelperError("Failed to create graphics shape")
-
-                # Convert image path to file URL
-                image_url = uno.systemPathToFileUrl(image_path)
-                logging.info(f"Image URL: {image_url}")
-
-                # Set the image URL
-                image_shape.GraphicURL = image_url
-
-                # Calculate scaling to fit within maximum dimensions while preserving aspect ratio
-                width_scale = max_width / original_width
-                height_scale = max_height / original_height
-                scale_factor = min(
-                    width_scale, height_scale, 1.0
-                )  # Don't scale up, only down
-
-                new_width = int(original_width * scale_factor)
-                new_height = int(original_height * scale_factor)
-
-                # Ensure minimum size (at least 10mm x 10mm)
-                min_size = 1000  # 10mm in 1/100mm
-                if new_width < min_size:
-                    new_width = min_size
-                if new_height < min_size:
-                    new_height = min_size
-
-                logging.info(
-                    f"Width scale: {width_scale:.3f}, Height scale: {height_scale:.3f}"
-                )
-                logging.info(f"Final scale factor: {scale_factor:.3f}")
-                logging.info(f"Final image size: {new_width}x{new_height} (1/100mm)")
-
-                # Set the size
-                new_size = Size(new_width, new_height)
-                image_shape.setSize(new_size)
-
-                # PROPER CENTERING FOR DRAWING SHAPES
-                # Calculate center position relative to slide
-                slide_center_x = slide_width // 2
-                slide_center_y = slide_height // 2
-
-                # Calculate top-left position to center the image
-                pos_x = slide_center_x - (new_width // 2)
-                pos_y = slide_center_y - (new_height // 2)
-
-                logging.info(f"Slide center: ({slide_center_x}, {slide_center_y})")
-                logging.info(f"Image half-size: ({new_width // 2}, {new_height // 2})")
-                logging.info(f"Calculated centered position: ({pos_x}, {pos_y})")
-
-                # Set the position using the Point structure
-                image_position = uno.createUnoStruct("com.sun.star.awt.Point")
-                image_position.X = pos_x
-                image_position.Y = pos_y
-                image_shape.setPosition(image_position)
-
-                # Verify positioning
-                actual_position = image_shape.getPosition()
-                logging.info(
-                    f"Actual position after setting: ({actual_position.X}, {actual_position.Y})"
-                )
-
-                # Add the shape to the slide
-                target_slide.add(image_shape)
-
-                # Set additional properties for better image handling
-                try:
-                    if hasattr(image_shape, "KeepAspectRatio"):
-                        image_shape.KeepAspectRatio = True
-                        logging.info("Set KeepAspectRatio property")
-
-                    # For drawing shapes, we can also try to set transformation matrix for perfect centering
-                    if hasattr(image_shape, "Transformation"):
-                        # The transformation matrix can be used for more precise positioning
-                        # This is an advanced feature but might help with centering
-                        logging.info("Shape has Transformation property available")
-
-                except Exception as prop_error:
-                    logging.warning(
-                        f"Could not set additional image properties: {prop_error}"
-                    )
-
-                # Final verification of image bounds
-                final_position = image_shape.getPosition()
-                final_size = image_shape.getSize()
-                image_right = final_position.X + final_size.Width
-                image_bottom = final_position.Y + final_size.Height
-
-                logging.info("Final verification:")
-                logging.info(
-                    f"Image position: ({final_position.X}, {final_position.Y})"
-                )
-                logging.info(f"Image size: {final_size.Width}x{final_size.Height}")
-                logging.info(
-                    f"Image bounds: X({final_position.X} to {image_right}), Y({final_position.Y} to {image_bottom})"
-                )
-                logging.info(
-                    f"Slide bounds: X(0 to {slide_width}), Y(0 to {slide_height})"
-                )
-
-                # Check if image is properly contained within slide
-                if (
-                    final_position.X >= 0
-                    and final_position.Y >= 0
-                    and image_right <= slide_width
-                    and image_bottom <= slide_height
-                ):
-                    logging.info("Image is properly contained within slide boundaries")
-                else:
-                    logging.warning("Image may extend beyond slide boundaries")
-
-            except Exception as image_error:
-                error_msg = f"Failed to create and configure image shape: {image_error}"
-                logging.error(error_msg)
-                raise HelperError(error_msg)
-
             # Save document
             logging.info("Saving document...")
-            doc.store()
+            store_document(doc)
 
             success_msg = f"Successfully inserted image '{os.path.basename(image_path)}' into slide {slide_index} of {file_path}"
             success_msg += f" (resized to {new_width // 100}x{new_height // 100}mm, centered on slide)"
@@ -3116,10 +4274,17 @@ COMMAND_HANDLERS = {
     "create_document": lambda cmd: create_document(
         cmd.get("doc_type", "text"), cmd.get("file_path", ""), cmd.get("metadata", None)
     ),
-    "read_text_document": lambda cmd: extract_text(cmd.get("file_path", "")),
+    "read_text_document": lambda cmd: extract_text(
+        cmd.get("file_path", ""),
+        cmd.get("start_paragraph", None),
+        cmd.get("max_paragraphs", None),
+        cmd.get("start_char", None),
+        cmd.get("max_chars", None),
+    ),
     "get_document_properties": lambda cmd: get_document_properties(
         cmd.get("file_path", "")
     ),
+    "get_outline": lambda cmd: get_outline(cmd.get("file_path", "")),
     "list_documents": lambda cmd: list_documents(cmd.get("directory", "")),
     "copy_document": lambda cmd: copy_document(
         cmd.get("source_path", ""), cmd.get("target_path", "")
@@ -3131,19 +4296,44 @@ COMMAND_HANDLERS = {
         cmd.get("title", None),
         cmd.get("content", None),
     ),
+    "build_presentation": lambda cmd: build_presentation(
+        cmd.get("file_path", ""),
+        cmd.get("slides", []),
+        cmd.get("replace_existing", False),
+    ),
     "edit_slide_content": lambda cmd: edit_slide_content(
         cmd.get("file_path", ""), cmd.get("slide_index", 0), cmd.get("new_content", "")
     ),
+    "edit_slide_bullets": lambda cmd: edit_slide_bullets(
+        cmd.get("file_path", ""),
+        cmd.get("slide_index", 0),
+        cmd.get("operations", []),
+    ),
     "edit_slide_title": lambda cmd: edit_slide_title(
         cmd.get("file_path", ""), cmd.get("slide_index", 0), cmd.get("new_title", "")
     ),
     "delete_slide": lambda cmd: delete_slide(
         cmd.get("file_path", ""), cmd.get("slide_index", 0)
     ),
-    "read_presentation": lambda cmd: extract_impress_text(cmd.get("file_path", "")),
+    "read_presentation": lambda cmd: extract_impress_text(
+        cmd.get("file_path", ""),
+        cmd.get("start_slide", None),
+        cmd.get("max_slides", None),
+    ),
     "apply_presentation_template": lambda cmd: apply_presentation_template(
         cmd.get("file_path", ""), cmd.get("template_name", "")
     ),
+    "list_templates": lambda cmd: list_templates(cmd.get("refresh", False)),
+    "move_slides": lambda cmd: move_slides(
+        cmd.get("file_path", ""),
+        cmd.get("slide_indices", []),
+        cmd.get("target_index", 0),
+    ),
+    "duplicate_slides": lambda cmd: duplicate_slides(
+        cmd.get("file_path", ""),
+        cmd.get("slide_indices", []),
+        cmd.get("target_index", None),
+    ),
     "format_slide_content": lambda cmd: format_slide_content(
         cmd.get("file_path", ""),
         cmd.get("slide_index", 0),
@@ -3162,7 +4352,8 @@ COMMAND_HANDLERS = {
         cmd.get("max_height", None),
         cmd.get("img_width_px", None),
         cmd.get("img_height_px", None),
-        cmd.get("dpi", 96),
+        cmd.get("dpi", None),
+        cmd.get("optimize_dpi", None),
     ),
     # Writer content creation
     "add_text": lambda cmd: add_text(
@@ -3177,6 +4368,12 @@ COMMAND_HANDLERS = {
         cmd.get("style", None),
         cmd.get("alignment", None),
     ),
+    "build_document": lambda cmd: build_document(
+        cmd.get("file_path", ""), cmd.get("blocks", [])
+    ),
+    "add_list": lambda cmd: add_list(
+        cmd.get("file_path", ""), cmd.get("items", []), cmd.get("numbered", False)
+    ),
     "add_table": lambda cmd: add_table(
         cmd.get("file_path", ""),
         cmd.get("rows", 2),
@@ -3184,11 +4381,21 @@ COMMAND_HANDLERS = {
         cmd.get("data", None),
         cmd.get("header_row", False),
     ),
+    "import_table": lambda cmd: import_table(
+        cmd.get("file_path", ""),
+        cmd.get("data_path", ""),
+        cmd.get("delimiter", None),
+        cmd.get("header_row", True),
+        cmd.get("max_rows", None),
+        cmd.get("align_numbers", True),
+    ),
     "insert_image": lambda cmd: insert_image(
         cmd.get("file_path", ""),
         cmd.get("image_path", ""),
         cmd.get("width", None),
         cmd.get("height", None),
+        cmd.get("optimize_dpi", None),
+        cmd.get("paragraph_index", None),
     ),
     "insert_page_break": lambda cmd: insert_page_break(cmd.get("file_path", "")),
     # Text formatting
@@ -3202,6 +4409,9 @@ COMMAND_HANDLERS = {
             "color": cmd.get("color", None),
             "font": cmd.get("font", None),
             "size": cmd.get("size", None),
+            "regex": cmd.get("regex", False),
+            "whole_word": cmd.get("whole_word", False),
+            "case_sensitive": cmd.get("case_sensitive", False),
         },
     ),
     "search_replace_text": lambda cmd: search_replace_text(
@@ -3209,6 +4419,9 @@ COMMAND_HANDLERS = {
         cmd.get("search_text", ""),
         cmd.get("replace_text", ""),
     ),
+    "search_replace_many": lambda cmd: search_replace_many(
+        cmd.get("file_path", ""), cmd.get("replacements", [])
+    ),
     "delete_text": lambda cmd: delete_text(
         cmd.get("file_path", ""), cmd.get("text_to_delete", "")
     ),
@@ -3218,6 +4431,11 @@ COMMAND_HANDLERS = {
         cmd.get("table_index", 0),
         cmd.get("format_options", {}),
     ),
+    "format_tables": lambda cmd: format_tables(
+        cmd.get("file_path", ""),
+        cmd.get("format_options", {}),
+        cmd.get("table_indices", None),
+    ),
     # Advanced document manipulation
     # "create_custom_style": lambda cmd: create_custom_style(
     #     cmd.get("file_path", ""),
@@ -3228,7 +4446,7 @@ COMMAND_HANDLERS = {
         cmd.get("file_path", ""), cmd.get("paragraph_index", 0)
     ),
     "apply_document_style": lambda cmd: apply_document_style(
-        cmd.get("file_path", ""), cmd.get("style", {})
+        cmd.get("file_path", ""), cmd.get("style", {}), cmd.get("mode", "direct")
     ),
     # Testing functions
     "get_text_formatting": lambda cmd: get_text_formatting(
@@ -0,0 +1,311 @@
+import os
+import math
+import struct
+import hashlib
+import logging
+import tempfile
+from collections import OrderedDict
+
+import uno
+from com.sun.star.beans import PropertyValue
+
+from helper_utils import create_property_value, get_cached, set_cached, HelperError
+
+DEFAULT_DPI = 96
+INCHES_PER_METER = 0.0254
+
+# Optimized copies of images, named after the source content and target size
+OPTIMIZED_IMAGE_DIR = os.path.join(tempfile.gettempdir(), "libreoffice_ai_images")
+JPEG_QUALITY = 85
+PNG_COMPRESSION = 9
+
+# Loaded graphics shared between insertions of the same image content,
+# least recently used first
+GRAPHIC_CACHE_SIZE = 32
+_loaded_graphics = OrderedDict()
+
+# JPEG start-of-frame markers carry the image size; C4, C8 and CC are not frames
+JPEG_SOF_MARKERS = {
+    0xC0,
+    0xC1,
+    0xC2,
+    0xC3,
+    0xC5,
+    0xC6,
+    0xC7,
+    0xC9,
+    0xCA,
+    0xCB,
+    0xCD,
+    0xCE,
+    0xCF,
+}
+
+
+def _read_png(f):
+    f.seek(16)
+    width, height = struct.unpack(">II", f.read(8))
+    dpi = None
+    # Walk the chunk headers up to the image data looking for pHYs
+    f.seek(8)
+    while True:
+        header = f.read(8)
+        if len(header) < 8:
+            break
+        length, chunk_type = struct.unpack(">I4s", header)
+        if chunk_type == b"pHYs":
+            x_ppu, y_ppu, unit = struct.unpack(">IIB", f.read(9))
+            if unit == 1:
+                dpi = (x_ppu * INCHES_PER_METER, y_ppu * INCHES_PER_METER)
+            break
+        if chunk_type in (b"IDAT", b"IEND"):
+            break
+        f.seek(length + 4, 1)  # Skip data and CRC
+    return "png", width, height, dpi
+
+
+def _read_gif(f):
+    f.seek(6)
+    width, height = struct.unpack("<HH", f.read(4))
+    return "gif", width, height, None
+
+
+def _read_bmp(f):
+    f.seek(14)
+    header_size = struct.unpack("<I", f.read(4))[0]
+    if header_size == 12:
+        width, height = struct.unpack("<HH", f.read(4))
+        return "bmp", width, height, None
+    width, height = struct.unpack("<ii", f.read(8))
+    dpi = None
+    if header_size >= 40:
+        f.seek(38)
+        x_ppm, y_ppm = struct.unpack("<ii", f.read(8))
+        if x_ppm > 0 and y_ppm > 0:
+            dpi = (x_ppm * INCHES_PER_METER, y_ppm * INCHES_PER_METER)
+    return "bmp", width, abs(height), dpi
+
+
+def _read_jpeg(f):
+    f.seek(2)
+    dpi = None
+    while True:
+        marker = f.read(2)
+        if len(marker) < 2 or marker[0] != 0xFF:
+            return None
+        code = marker[1]
+        if code == 0xFF:
+            # Fill byte, the marker code follows
+            f.seek(-1, 1)
+            continue
+        if code in (0x01,) or 0xD0 <= code <= 0xD7:
+            continue  # Markers without a length
+        length = struct.unpack(">H", f.read(2))[0]
+        if code in JPEG_SOF_MARKERS:
+            height, width = struct.unpack(">xHH", f.read(5))
+            return "jpeg", width, height, dpi
+        if code == 0xE0 and length >= 16:
+            segment = f.read(length - 2)
+            if segment[:5] == b"JFIF\x00":
+                units, x_density, y_density = struct.unpack(">BHH", segment[7:12])
+                if units == 1:
+                    dpi = (x_density, y_density)
+                elif units == 2:
+                    dpi = (x_density * 2.54, y_density * 2.54)
+            continue
+        if code == 0xDA:
+            return None  # Scan data reached without a frame header
+        f.seek(length - 2, 1)
+
+
+def _read_webp(f):
+    f.seek(12)
+    chunk_type = f.read(4)
+    f.seek(20)
+    data = f.read(10)
+    if chunk_type == b"VP8 " and len(data) >= 10:
+        width, height = struct.unpack("<HH", data[6:10])
+        return "webp", width & 0x3FFF, height & 0x3FFF, None
+    if chunk_type == b"VP8L" and len(data) >= 5:
+        bits = struct.unpack("<I", data[1:5])[0]
+        return "webp", (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1, None
+    if chunk_type == b"VP8X" and len(data) >= 10:
+        width = int.from_bytes(data[4:7], "little") + 1
+        height = int.from_bytes(data[7:10], "little") + 1
+        return "webp", width, height, None
+    return None
+
+
+def read_image_header(image_path):
+    """
+    Read the pixel size and resolution of an image from its file header.
+
+    Supports PNG, JPEG, GIF, BMP and WebP without decoding the image. Returns a
+    dict with format, width, height and dpi (an (x, y) tuple or None), or None
+    if the format is not recognised.
+    """
+    with open(image_path, "rb") as f:
+        head = f.read(16)
+        if head.startswith(b"\x89PNG\r\n\x1a\n"):
+            reader = _read_png
+        elif head[:2] == b"\xff\xd8":
+            reader = _read_jpeg
+        elif head[:6] in (b"GIF87a", b"GIF89a"):
+            reader = _read_gif
+        elif head[:2] == b"BM":
+            reader = _read_bmp
+        elif head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+            reader = _read_webp
+        else:
+            return None
+        try:
+            result = reader(f)
+        except struct.error:
+            result = None
+    if not result:
+        return None
+    image_format, width, height, dpi = result
+    if dpi and not (dpi[0] > 0 and dpi[1] > 0):
+        dpi = None
+    return {"format": image_format, "width": width, "height": height, "dpi": dpi}
+
+
+def get_image_info(image_path):
+    """Return the header info of an image, cached until the file changes."""
+    info = get_cached(image_path, "image_info")
+    if info is None:
+        info = read_image_header(image_path)
+        if info is None:
+            logging.warning(f"Could not read image header: {image_path}")
+            return None
+        set_cached(image_path, "image_info", info)
+    return info
+
+
+def image_size_100mm(info, dpi=None):
+    """
+    Convert an image's pixel size to 1/100mm.
+
+    Uses the given dpi, falling back to the resolution stored in the image and
+    then to DEFAULT_DPI.
+    """
+    if dpi:
+        x_dpi = y_dpi = dpi
+    elif info["dpi"]:
+        x_dpi, y_dpi = info["dpi"]
+    else:
+        x_dpi = y_dpi = DEFAULT_DPI
+    return (
+        int(info["width"] * 2540 / x_dpi),
+        int(info["height"] * 2540 / y_dpi),
+    )
+
+
+def get_content_hash(image_path):
+    """Return the SHA-1 of an image's content, cached until the file changes."""
+    digest = get_cached(image_path, "content_hash")
+    if digest is None:
+        sha = hashlib.sha1()
+        with open(image_path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                sha.update(block)
+        digest = set_cached(image_path, "content_hash", sha.hexdigest())
+    return digest
+
+
+def get_graphic_provider():
+    ctx = uno.getComponentContext()
+    return ctx.ServiceManager.createInstanceWithContext(
+        "com.sun.star.graphic.GraphicProvider", ctx
+    )
+
+
+def load_graphic(image_path):
+    """
+    Return a loaded XGraphic for an image.
+
+    Graphics are keyed by content hash, so inserting the same image again, into
+    the same or another document, reuses one graphic object instead of loading
+    and embedding a new copy.
+    """
+    key = get_content_hash(image_path)
+    graphic = _loaded_graphics.get(key)
+    if graphic is not None:
+        _loaded_graphics.move_to_end(key)
+        return graphic
+
+    graphic = get_graphic_provider().queryGraphic(
+        (create_property_value("URL", uno.systemPathToFileUrl(image_path)),)
+    )
+    if graphic is None:
+        raise HelperError(f"Could not load image: {image_path}")
+    _loaded_graphics[key] = graphic
+    if len(_loaded_graphics) > GRAPHIC_CACHE_SIZE:
+        _loaded_graphics.popitem(last=False)
+    return graphic
+
+
+def optimize_image(image_path, display_width, display_height, dpi):
+    """
+    Return the path of a copy of the image resampled for its display size.
+
+    display_width and display_height are in 1/100mm. The image is scaled down
+    to the pixel size those need at the given dpi and recompressed with
+    LibreOffice's graphic filters; JPEGs stay JPEG, everything else becomes
+    PNG. Images already small enough are returned unchanged. Optimized copies
+    are keyed by content hash, so each image is only processed once.
+    """
+    info = get_image_info(image_path)
+    if not info:
+        return image_path
+
+    pixel_width = math.ceil(display_width * dpi / 2540)
+    pixel_height = math.ceil(display_height * dpi / 2540)
+    if pixel_width >= info["width"] and pixel_height >= info["height"]:
+        return image_path
+
+    is_jpeg = info["format"] == "jpeg"
+    output_path = os.path.join(
+        OPTIMIZED_IMAGE_DIR,
+        f"{get_content_hash(image_path)}_{pixel_width}x{pixel_height}"
+        + (".jpg" if is_jpeg else ".png"),
+    )
+    if os.path.exists(output_path):
+        logging.info(f"Reusing optimized image: {output_path}")
+        return output_path
+
+    os.makedirs(OPTIMIZED_IMAGE_DIR, exist_ok=True)
+    provider = get_graphic_provider()
+    # Load the original directly; only the optimized copy should be kept around
+    graphic = provider.queryGraphic(
+        (create_property_value("URL", uno.systemPathToFileUrl(image_path)),)
+    )
+
+    filter_data = [
+        create_property_value("PixelWidth", pixel_width),
+        create_property_value("PixelHeight", pixel_height),
+    ]
+    if is_jpeg:
+        filter_data.append(create_property_value("Quality", JPEG_QUALITY))
+    else:
+        filter_data.append(create_property_value("Compression", PNG_COMPRESSION))
+
+    provider.storeGraphic(
+        graphic,
+        (
+            create_property_value("URL", uno.systemPathToFileUrl(output_path)),
+            create_property_value("MimeType", "image/jpeg" if is_jpeg else "image/png"),
+            # uno.Any is only accepted when a struct is constructed, so the
+            # filter data keeps its PropertyValue sequence type
+            PropertyValue(
+                "FilterData",
+                0,
+                uno.Any("[]com.sun.star.beans.PropertyValue", tuple(filter_data)),
+                0,
+            ),
+        ),
+    )
+    logging.info(
+        f"Optimized image {image_path} from {info['width']}x{info['height']} to {pixel_width}x{pixel_height} pixels"
+    )
+    return output_path
@@ -1,7 +1,7 @@
 import logging
 import json
 import os
-from helper_utils import managed_document, HelperError
+from helper_utils import managed_document, get_paragraph_index, HelperError
 from com.sun.star.awt.FontSlant import ITALIC
 from com.sun.star.table import BorderLine2, TableBorder2
 from com.sun.star.table.BorderLineStyle import SOLID
@@ -190,8 +190,7 @@ def get_table_info(file_path, table_index=0):
             row_data = []
             for col_idx in range(column_count):
                 try:
-                    cell_name = chr(65 + col_idx) + str(row_idx + 1)  # A1, B1, etc.
-                    cell = table.getCellByName(cell_name)
+                    cell = table.getCellByPosition(col_idx, row_idx)
                     cell_text = (
                         cell.getText().getString() if hasattr(cell, "getText") else ""
                     )
@@ -397,61 +396,34 @@ def get_page_break_info(file_path):
 
         text = doc.getText()
 
-        # Method 1: Check paragraphs for BreakType property
-        text_enum = text.createEnumeration()
+        # Method 1: Check paragraphs for BreakType using the cached paragraph index
         page_break_count = 0
         paragraph_details = []
 
-        paragraph_index = 0
-        while text_enum.hasMoreElements():
-            paragraph = text_enum.nextElement()
+        for paragraph_index, entry in enumerate(get_paragraph_index(doc, file_path)):
             paragraph_info = {
                 "index": paragraph_index,
                 "has_break": False,
-                "break_type": None,
+                "break_type": entry["break_type"],
             }
 
-            try:
-                if hasattr(paragraph, "BreakType"):
-                    break_type = paragraph.BreakType
-                    paragraph_info["break_type"] = str(break_type)
-
-                    # Handle different ways the enum might be represented
-                    if hasattr(break_type, "value"):
-                        break_value = break_type.value
-                    else:
-                        # Convert string representation to check for page break types
-                        break_str = str(break_type).upper()
-                        if "PAGE_BEFORE" in break_str:
-                            break_value = "PAGE_BEFORE"
-                        elif "PAGE_AFTER" in break_str:
-                            break_value = "PAGE_AFTER"
-                        elif "PAGE_BOTH" in break_str:
-                            break_value = "PAGE_BOTH"
-                        else:
-                            break_value = "NONE"
-
-                    paragraph_info["break_value"] = break_value
-
-                    # Check for any page break type
-                    if break_value in ["PAGE_BEFORE", "PAGE_AFTER", "PAGE_BOTH"]:
-                        page_break_count += 1
-                        paragraph_info["has_break"] = True
-
-                # Also check the paragraph text content
-                if hasattr(paragraph, "getString"):
-                    para_text = paragraph.getString()
-                    paragraph_info["text"] = (
-                        para_text[:50] + "..." if len(para_text) > 50 else para_text
-                    )
-                    paragraph_info["length"] = len(para_text)
+            if entry["kind"] == "paragraph":
+                break_value = entry["break_type"]
+                paragraph_info["break_value"] = break_value
 
-            except Exception as e:
-                paragraph_info["error"] = str(e)
-                logging.debug(f"Error checking paragraph {paragraph_index}: {e}")
+                # Check for any page break type
+                if break_value in ["PAGE_BEFORE", "PAGE_AFTER", "PAGE_BOTH"]:
+                    page_break_count += 1
+                    paragraph_info["has_break"] = True
+
+                paragraph_info["text"] = (
+                    entry["preview"] + "..."
+                    if entry["length"] > 50
+                    else entry["preview"]
+                )
+                paragraph_info["length"] = entry["length"]
 
             paragraph_details.append(paragraph_info)
-            paragraph_index += 1
 
         # Method 2: Check for manual page breaks (form feed characters)
         text_content = text.getString()
@@ -63,18 +63,211 @@ class HelperError(Exception):
     pass
 
 
+# Set LIBREOFFICEAI_PRESERVE_UNDO=1 to keep recording helper edits in the
+# undo stack, e.g. when the helper works on documents the user has open
+PRESERVE_UNDO = os.environ.get("LIBREOFFICEAI_PRESERVE_UNDO") == "1"
+
+
 @contextmanager
 def managed_document(file_path, read_only=False):
     doc, message = open_document(file_path, read_only)
     if not doc:
         raise HelperError(message)
     try:
+        if not read_only:
+            lock_document(doc)
         yield doc
     finally:
+        # Close the hidden document even if releasing a lock fails
         try:
-            doc.close(True)
-        except Exception:
-            pass
+            release_document_locks(doc)
+        except Exception as release_error:
+            logging.warning(f"Could not release document locks: {release_error}")
+        finally:
+            try:
+                doc.close(True)
+            except Exception:
+                pass
+
+
+def document_is_visible(doc):
+    """Return True if the document is shown in a visible window."""
+    try:
+        return doc.getCurrentController().getFrame().getContainerWindow().isVisible()
+    except Exception:
+        return False
+
+
+# Locks taken by lock_document, keyed by id(doc). The document is kept with its
+# locks so the id stays valid until release_document_locks undoes them.
+_document_locks = {}
+
+
+def lock_document(doc):
+    """
+    Suspend view updates, re-layout and undo recording while the helper edits a
+    document. Undo recording is kept when PRESERVE_UNDO is set or when the
+    document is visible to the user.
+    """
+    # Record each lock as soon as it is taken, so a failure part way through
+    # still leaves the earlier ones to release
+    locks = _document_locks.setdefault(id(doc), (doc, []))[1]
+    if hasattr(doc, "lockControllers"):
+        doc.lockControllers()
+        locks.append("controllers")
+    if hasattr(doc, "addActionLock"):
+        doc.addActionLock()
+        locks.append("action")
+    if (
+        not PRESERVE_UNDO
+        and hasattr(doc, "getUndoManager")
+        and not document_is_visible(doc)
+    ):
+        doc.getUndoManager().lock()
+        locks.append("undo")
+
+
+def release_document_locks(doc):
+    """Undo the locks lock_document took, leaving locks held by others in place."""
+    _, locks = _document_locks.pop(id(doc), (doc, []))
+    for lock in reversed(locks):
+        if lock == "controllers":
+            doc.unlockControllers()
+        elif lock == "action":
+            doc.removeActionLock()
+        else:
+            doc.getUndoManager().unlock()
+
+
+def store_document(doc):
+    """Release the edit locks, letting the document lay out once, then store it."""
+    release_document_locks(doc)
+    doc.store()
+
+
+# Derived document data (outlines, statistics, ...) cached per file and kind.
+# Entries are only valid while the file's modification time and size match.
+_document_cache = {}
+
+
+def get_file_signature(file_path):
+    """Return a signature that changes whenever the file is rewritten."""
+    stats = os.stat(file_path)
+    return (stats.st_mtime_ns, stats.st_size)
+
+
+def get_cached(file_path, kind):
+    """Return cached data for a file, or None if missing or stale."""
+    key = (normalize_path(file_path), kind)
+    entry = _document_cache.get(key)
+    if entry is None:
+        return None
+    try:
+        signature = get_file_signature(key[0])
+    except OSError:
+        signature = None
+    if entry[0] != signature:
+        del _document_cache[key]
+        return None
+    return entry[1]
+
+
+def set_cached(file_path, kind, value):
+    """Cache data for a file against its current signature."""
+    path = normalize_path(file_path)
+    _document_cache[(path, kind)] = (get_file_signature(path), value)
+    return value
+
+
+def invalidate_cached(file_path, kind=None):
+    """Drop cached data for a file, either one kind or all of it."""
+    path = normalize_path(file_path)
+    for key in list(_document_cache):
+        if key[0] == path and (kind is None or key[1] == kind):
+            del _document_cache[key]
+
+
+def build_paragraph_index(text, wanted=()):
+    """
+    Walk the top-level paragraphs of a text once.
+
+    Returns a list of index entries (kind, character offset within the body text,
+    length, break type and a short preview) together with a dict of paragraph
+    proxies for the indices in wanted.
+    """
+    wanted = set(wanted)
+    entries = []
+    proxies = {}
+    offset = 0
+    enum = text.createEnumeration()
+    while enum.hasMoreElements():
+        element = enum.nextElement()
+        index = len(entries)
+        if index in wanted:
+            proxies[index] = element
+        if element.supportsService("com.sun.star.text.TextTable"):
+            entries.append(
+                {
+                    "kind": "table",
+                    "offset": offset,
+                    "length": 0,
+                    "break_type": None,
+                    "preview": f"[Table: {element.getName()}]",
+                }
+            )
+        else:
+            element_text = element.getString()
+            entries.append(
+                {
+                    "kind": "paragraph",
+                    "offset": offset,
+                    "length": len(element_text),
+                    "break_type": element.getPropertyValue("BreakType").value,
+                    "preview": element_text[:50],
+                }
+            )
+            # Each paragraph is followed by a single paragraph break
+            offset += len(element_text) + 1
+    return entries, proxies
+
+
+def collect_paragraphs(text, wanted):
+    """Return proxies for the wanted paragraph indices, stopping after the last one."""
+    wanted = set(wanted)
+    last_wanted = max(wanted) if wanted else -1
+    proxies = {}
+    index = 0
+    enum = text.createEnumeration()
+    while index <= last_wanted and enum.hasMoreElements():
+        element = enum.nextElement()
+        if index in wanted:
+            proxies[index] = element
+        index += 1
+    return proxies
+
+
+def remove_paragraph_index_entries(entries, removed):
+    """Return a copy of the index without the removed entries, with offsets shifted."""
+    removed = set(removed)
+    updated = []
+    offset = 0
+    for index, entry in enumerate(entries):
+        if index in removed:
+            continue
+        entry = dict(entry, offset=offset)
+        if entry["kind"] == "paragraph":
+            offset += entry["length"] + 1
+        updated.append(entry)
+    return updated
+
+
+def get_paragraph_index(doc, file_path):
+    """Return the cached paragraph index for a document, building it if needed."""
+    entries = get_cached(file_path, "paragraph_index")
+    if entries is None:
+        entries, _ = build_paragraph_index(doc.getText())
+        set_cached(file_path, "paragraph_index", entries)
+    return entries
 
 
 # Helper functions
@@ -114,24 +307,28 @@ def normalize_path(file_path):
     return file_path
 
 
-def get_uno_desktop():
-    """Get LibreOffice desktop object."""
+def get_office_context():
+    """Connect to the running LibreOffice and return its component context."""
+    local_context = uno.getComponentContext()
+    resolver = local_context.ServiceManager.createInstanceWithContext(
+        "com.sun.star.bridge.UnoUrlResolver", local_context
+    )
+
+    # Try both localhost and 127.0.0.1
     try:
-        local_context = uno.getComponentContext()
-        resolver = local_context.ServiceManager.createInstanceWithContext(
-            "com.sun.star.bridge.UnoUrlResolver", local_context
+        return resolver.resolve(
+            "uno:socket,host=localhost,port=2002;urp;StarOffice.ComponentContext"
+        )
+    except NoConnectException:
+        return resolver.resolve(
+            "uno:socket,host=127.0.0.1,port=2002;urp;StarOffice.ComponentContext"
         )
 
-        # Try both localhost and 127.0.0.1
-        try:
-            context = resolver.resolve(
-                "uno:socket,host=localhost,port=2002;urp;StarOffice.ComponentContext"
-            )
-        except NoConnectException:
-            context = resolver.resolve(
-                "uno:socket,host=127.0.0.1,port=2002;urp;StarOffice.ComponentContext"
-            )
 
+def get_uno_desktop():
+    """Get LibreOffice desktop object."""
+    try:
+        context = get_office_context()
         desktop = context.ServiceManager.createInstanceWithContext(
             "com.sun.star.frame.Desktop", context
         )